@@ -1,4 +1,4 @@
-use crate::models::config::AppConfig;
+use crate::models::config::{AppConfig, RegisteredHotkeys};
 use crate::services::hotkey_service::HotkeyService;
 use crate::utils::frozen_screen::FrozenScreenState;
 use crate::utils::logger;
@@ -10,6 +10,7 @@ pub struct ConfigState {
     pub config: Arc<RwLock<AppConfig>>,
     pub config_path: PathBuf,
     pub logs_dir: PathBuf,
+    pub registered_hotkeys: RwLock<RegisteredHotkeys>,
 }
 
 #[tauri::command]
@@ -26,12 +27,30 @@ pub async fn save_config(
     frozen_screen: State<'_, Arc<FrozenScreenState>>,
 ) -> Result<(), String> {
     logger::info("config", format!("save requested: {:?}", new_config));
-    HotkeyService::register_and_listen(
-        app_handle,
-        &new_config,
-        state.logs_dir.clone(),
-        frozen_screen.inner().clone(),
-    )?;
+    // Compare against what is registered rather than the saved config: a failed
+    // registration leaves no shortcuts behind even though the config is unchanged.
+    let needs_registration = state
+        .registered_hotkeys
+        .read()
+        .map(|registered| registered.needs_registration(&new_config))
+        .unwrap_or(true);
+    if needs_registration {
+        let result = HotkeyService::register_and_listen(
+            app_handle,
+            &new_config,
+            state.logs_dir.clone(),
+            frozen_screen.inner().clone(),
+        );
+        if let Ok(mut registered) = state.registered_hotkeys.write() {
+            registered.record(&new_config, result.is_ok());
+        }
+        result?;
+    } else {
+        logger::info(
+            "config",
+            "hotkeys unchanged; keeping existing registrations",
+        );
+    }
 
     // Update in memory
     {
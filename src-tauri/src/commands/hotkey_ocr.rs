@@ -1,3 +1,4 @@
+use crate::models::config::OcrRegion;
 use crate::models::map::SearchResult;
 use crate::services::ocr_service::OcrService;
 use crate::utils::frozen_screen::FrozenScreenState;
@@ -30,16 +31,26 @@ pub async fn capture_mouse_ocr(
     ocr: State<'_, Arc<OcrService>>,
 ) -> Result<Vec<SearchResult>, String> {
     let (x, y) = global_cursor_position()?;
-    let vertical_offset = vertical_offset.unwrap_or(0);
+    let region = OcrRegion {
+        width,
+        height,
+        vertical_offset: vertical_offset.unwrap_or(0),
+    };
     logger::info(
         "ocr.mouse",
         format!(
             "invoke cursor=({}, {}) region={}x{} vertical_offset={}",
-            x, y, width, height, vertical_offset
+            x, y, region.width, region.height, region.vertical_offset
         ),
     );
 
-    match ocr.capture_mouse_region(x, y, width, height, vertical_offset) {
+    let ocr = ocr.inner().clone();
+    let outcome =
+        tauri::async_runtime::spawn_blocking(move || ocr.capture_mouse_region(x, y, region))
+            .await
+            .unwrap_or_else(|e| Err(format!("Mouse OCR task failed: {}", e)));
+
+    match outcome {
         Ok(results) => {
             logger::info("ocr.mouse", format!("completed results={}", results.len()));
             Ok(results)
@@ -76,7 +87,14 @@ pub async fn capture_region_ocr(
         }
     };
 
-    match ocr.ocr_region_image(cropped, x, y, width, height, "frozen") {
+    let ocr = ocr.inner().clone();
+    let outcome = tauri::async_runtime::spawn_blocking(move || {
+        ocr.ocr_region_image(cropped, x, y, width, height, "frozen")
+    })
+    .await
+    .unwrap_or_else(|e| Err(format!("Region OCR task failed: {}", e)));
+
+    match outcome {
         Ok(results) => {
             logger::info("ocr.region", format!("completed results={}", results.len()));
             Ok(results)
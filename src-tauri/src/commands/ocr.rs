@@ -7,5 +7,9 @@ use tauri::State;
 pub async fn capture_and_search(
     service: State<'_, Arc<OcrService>>,
 ) -> Result<Vec<SearchResult>, String> {
-    service.capture_and_search()
+    // Capture and tesseract block for a while; keep them off the async workers
+    let service = service.inner().clone();
+    tauri::async_runtime::spawn_blocking(move || service.capture_and_search())
+        .await
+        .map_err(|e| format!("OCR task failed: {}", e))?
 }
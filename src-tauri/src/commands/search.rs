@@ -8,11 +8,14 @@ pub async fn search_maps(
     query: String,
     max_results: Option<usize>,
     engine: State<'_, Arc<SearchEngine>>,
-) -> Result<Vec<SearchResult>, String> {
+) -> Result<Arc<[SearchResult]>, String> {
     if query.len() < 2 {
-        return Ok(vec![]);
+        return Ok(Arc::from([]));
     }
 
-    let results = engine.search(&query, max_results.unwrap_or(25));
-    Ok(results)
+    // Scoring is CPU-bound; keep it off the async workers that serve other commands
+    let engine = engine.inner().clone();
+    tauri::async_runtime::spawn_blocking(move || engine.search(&query, max_results.unwrap_or(25)))
+        .await
+        .map_err(|e| format!("Search task failed: {}", e))
 }
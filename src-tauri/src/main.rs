@@ -7,7 +7,7 @@ mod services;
 mod utils;
 
 use crate::commands::config::ConfigState;
-use crate::models::config::AppConfig;
+use crate::models::config::{AppConfig, RegisteredHotkeys};
 use crate::models::map::MapRecord;
 use crate::services::search_engine::SearchEngine;
 use crate::utils::logger;
@@ -50,6 +50,7 @@ fn main() {
                 config: shared_config.clone(),
                 config_path,
                 logs_dir: logs_dir.clone(),
+                registered_hotkeys: RwLock::new(RegisteredHotkeys::default()),
             });
 
             // try multiple paths for maps.json
@@ -74,20 +75,19 @@ fn main() {
                     .ok(),
             ];
 
-            let mut file_content = String::new();
+            let mut file_content: Vec<u8> = Vec::new();
             let mut found = false;
 
             for path in possible_paths.into_iter().flatten() {
                 println!("Trying to load maps.json from: {:?}", path);
                 logger::info("maps", format!("trying {:?}", path));
-                if path.exists() {
-                    if let Ok(content) = fs::read_to_string(&path) {
-                        file_content = content;
-                        found = true;
-                        println!("Successfully loaded maps.json from: {:?}", path);
-                        logger::info("maps", format!("loaded {:?}", path));
-                        break;
-                    }
+                // A failed read covers the missing-file case without an extra stat
+                if let Ok(content) = fs::read(&path) {
+                    file_content = content;
+                    found = true;
+                    println!("Successfully loaded maps.json from: {:?}", path);
+                    logger::info("maps", format!("loaded {:?}", path));
+                    break;
                 }
             }
 
@@ -96,15 +96,9 @@ fn main() {
                 return Err("Could not find maps.json in any checked paths".into());
             }
 
-            let mut records: Vec<MapRecord> = serde_json::from_str(&file_content)
-                .map_err(|e| format!("Failed to parse maps.json: {}", e))?;
+            let records = MapRecord::parse_all(&file_content)?;
             logger::info("maps", format!("parsed {} records", records.len()));
 
-            // Compute slug for each record
-            for record in &mut records {
-                record.slug = record.name.trim().to_lowercase().replace(" ", "-");
-            }
-
             let engine = Arc::new(SearchEngine::new(records));
 
             let app_handle = app.handle().clone();
@@ -114,6 +108,11 @@ fn main() {
 
             let ocr_service = Arc::new(service);
 
+            // Warm tesseract off the setup path so startup stays fast; the blocking
+            // pool is shared with the OCR and search commands
+            let warm_ocr = ocr_service.clone();
+            tauri::async_runtime::spawn_blocking(move || warm_ocr.warm_up());
+
             // Initialize hotkey service with Tauri plugin
             HotkeyService::register_and_listen(
                 app_handle.clone(),
@@ -122,6 +121,9 @@ fn main() {
                 frozen_screen.clone(),
             )
             .map_err(|e| format!("Failed to setup hotkeys: {}", e))?;
+            if let Ok(mut registered) = config_state.registered_hotkeys.write() {
+                registered.record(&config, true);
+            }
             logger::info("app", "setup completed");
 
             app.manage(engine);
@@ -141,6 +143,9 @@ fn main() {
             if matches!(event, tauri::WindowEvent::CloseRequested { .. }) {
                 let app_handle = window.app_handle();
                 let _ = app_handle.global_shortcut().unregister_all();
+                logger::info("app", "exiting");
+                // exit(0) ends the process without waiting for the log writer
+                logger::shutdown();
                 app_handle.exit(0);
             }
         })
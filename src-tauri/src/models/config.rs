@@ -2,13 +2,23 @@ use serde::{Deserialize, Serialize};
 use std::fs;
 use std::path::PathBuf;
 
-#[derive(Debug, Clone, Serialize, Deserialize)]
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Serialize, Deserialize)]
 pub struct OcrRegion {
     pub width: u32,
     pub height: u32,
     pub vertical_offset: i32,
 }
 
+impl OcrRegion {
+    /// Top-left corner of the capture band when the cursor sits at its bottom center
+    pub fn origin_above(self, mouse_x: i32, mouse_y: i32) -> (i32, i32) {
+        (
+            mouse_x - (self.width as i32 / 2),
+            mouse_y - self.height as i32 - self.vertical_offset,
+        )
+    }
+}
+
 impl Default for OcrRegion {
     fn default() -> Self {
         Self {
@@ -77,9 +87,30 @@ impl Default for AppConfig {
     }
 }
 
+/// Hotkey settings last registered with the OS. Registration unregisters the
+/// previous shortcuts first, so a failure leaves nothing registered.
+#[derive(Debug, Default)]
+pub struct RegisteredHotkeys {
+    current: Option<AppConfig>,
+}
+
+impl RegisteredHotkeys {
+    /// Whether `config` must be registered to become active
+    pub fn needs_registration(&self, config: &AppConfig) -> bool {
+        self.current
+            .as_ref()
+            .map_or(true, |current| current.hotkeys_differ(config))
+    }
+
+    /// Remember the outcome of registering `config`
+    pub fn record(&mut self, config: &AppConfig, registered: bool) {
+        self.current = registered.then(|| config.clone());
+    }
+}
+
 #[cfg(test)]
 mod tests {
-    use super::AppConfig;
+    use super::{AppConfig, OcrRegion, RegisteredHotkeys};
 
     #[test]
     fn deserializing_partial_config_uses_runtime_defaults() {
@@ -95,14 +126,49 @@ mod tests {
         assert_eq!(config.debounce_ms, 200);
         assert_eq!(config.language, "zh-CN");
     }
+
+    #[test]
+    fn only_hotkey_inputs_require_reregistration() {
+        let current = AppConfig::default();
+        let mut other = current.clone();
+        other.language = "en".to_string();
+        other.ocr_region.width = 800;
+        assert!(!current.hotkeys_differ(&other));
+
+        other.chat_hotkey = "ctrl+shift+e".to_string();
+        assert!(current.hotkeys_differ(&other));
+    }
+
+    #[test]
+    fn failed_registration_forces_the_next_save_to_register() {
+        let original = AppConfig::default();
+        let mut registered = RegisteredHotkeys::default();
+        assert!(registered.needs_registration(&original));
+        registered.record(&original, true);
+        assert!(!registered.needs_registration(&original));
+
+        // The new combo is taken elsewhere; the old one was already unregistered
+        let mut taken = original.clone();
+        taken.mouse_hotkey = "ctrl+alt+q".to_string();
+        assert!(registered.needs_registration(&taken));
+        registered.record(&taken, false);
+
+        // Reverting must register the original combo again
+        assert!(registered.needs_registration(&original));
+    }
+
+    #[test]
+    fn ocr_region_origin_sits_above_cursor() {
+        assert_eq!(OcrRegion::default().origin_above(1000, 500), (705, 420));
+    }
 }
 
 impl AppConfig {
     /// Load config from file, or create default if not exists
     pub fn load(config_path: &PathBuf) -> Self {
         if config_path.exists() {
-            match fs::read_to_string(config_path) {
-                Ok(content) => match serde_json::from_str(&content) {
+            match fs::read(config_path) {
+                Ok(content) => match serde_json::from_slice(&content) {
                     Ok(config) => {
                         println!("Loaded config from {:?}", config_path);
                         return config;
@@ -122,13 +188,20 @@ impl AppConfig {
         config
     }
 
+    /// Whether moving to `other` needs the global hotkeys registered again
+    pub fn hotkeys_differ(&self, other: &AppConfig) -> bool {
+        self.mouse_hotkey != other.mouse_hotkey
+            || self.chat_hotkey != other.chat_hotkey
+            || self.ocr_debug != other.ocr_debug
+    }
+
     /// Save config to file
     pub fn save(&self, config_path: &PathBuf) -> Result<(), String> {
         if let Some(parent) = config_path.parent() {
             fs::create_dir_all(parent).map_err(|e| e.to_string())?;
         }
 
-        let content = serde_json::to_string_pretty(self).map_err(|e| e.to_string())?;
+        let content = serde_json::to_vec_pretty(self).map_err(|e| e.to_string())?;
 
         fs::write(config_path, content).map_err(|e| format!("Failed to write config: {}", e))?;
 
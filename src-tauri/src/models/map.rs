@@ -1,20 +1,23 @@
 use serde::{Deserialize, Serialize};
+use std::collections::HashSet;
+use std::sync::Arc;
 
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct MapRecord {
     pub name: String,
     #[serde(default)]
     pub slug: String,
-    pub tier: String,
+    /// Interned by `parse_all`: records with the same tier share one allocation
+    pub tier: Arc<str>,
     #[serde(alias = "type")]
-    pub map_type: String,
+    pub map_type: Arc<str>,
     pub chests: Chests,
     pub dungeons: Dungeons,
     pub resources: Resources,
     pub brecilien: u32,
 }
 
-#[derive(Debug, Clone, Serialize, Deserialize)]
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Serialize, Deserialize)]
 pub struct Chests {
     pub blue: u32,
     pub green: u32,
@@ -24,14 +27,14 @@ pub struct Chests {
     pub low_gold: u32,
 }
 
-#[derive(Debug, Clone, Serialize, Deserialize)]
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Serialize, Deserialize)]
 pub struct Dungeons {
     pub solo: u32,
     pub group: u32,
     pub avalon: u32,
 }
 
-#[derive(Debug, Clone, Serialize, Deserialize)]
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Serialize, Deserialize)]
 pub struct Resources {
     pub rock: u32,
     pub wood: u32,
@@ -40,19 +43,90 @@ pub struct Resources {
     pub hide: u32,
 }
 
-#[derive(Debug, Clone, Serialize, Deserialize)]
+#[derive(Debug, Clone, Serialize)]
 pub struct SearchResult {
-    pub record: MapRecord,
+    /// Shared with the search engine, so results never deep-copy a record
+    pub record: Arc<MapRecord>,
     pub score: f64,
-    pub method: String,
+    pub method: &'static str,
     #[serde(skip_serializing_if = "Option::is_none")]
     pub positions: Option<Vec<usize>>,
 }
 
+impl MapRecord {
+    /// Decode the bundled maps.json payload straight from raw bytes and derive slugs
+    pub fn parse_all(bytes: &[u8]) -> Result<Vec<MapRecord>, String> {
+        let mut records: Vec<MapRecord> = serde_json::from_slice(bytes)
+            .map_err(|e| format!("Failed to parse maps.json: {}", e))?;
+
+        let mut interned: HashSet<Arc<str>> = HashSet::new();
+        for record in &mut records {
+            record.slug = slugify(&record.name);
+            record.tier = intern(&mut interned, &record.tier);
+            record.map_type = intern(&mut interned, &record.map_type);
+        }
+
+        Ok(records)
+    }
+}
+
+/// Return the pooled copy of `value`, adding it to the pool on first sight
+fn intern(pool: &mut HashSet<Arc<str>>, value: &Arc<str>) -> Arc<str> {
+    if let Some(existing) = pool.get(value) {
+        return existing.clone();
+    }
+    pool.insert(value.clone());
+    value.clone()
+}
+
+/// Lowercase and hyphenate a map name in a single allocation
+fn slugify(name: &str) -> String {
+    let mut slug = String::with_capacity(name.len());
+    for ch in name.trim().chars() {
+        if ch == ' ' {
+            slug.push('-');
+        } else {
+            slug.extend(ch.to_lowercase());
+        }
+    }
+    slug
+}
+
+/// Minimal record shared by the service tests
+#[cfg(test)]
+pub fn test_record(name: &str) -> MapRecord {
+    MapRecord {
+        name: name.to_string(),
+        slug: name.to_string(),
+        tier: "T4".into(),
+        map_type: "TUNNEL_ROYAL".into(),
+        chests: Chests {
+            blue: 0,
+            green: 0,
+            high_gold: 0,
+            low_gold: 0,
+        },
+        dungeons: Dungeons {
+            solo: 0,
+            group: 0,
+            avalon: 0,
+        },
+        resources: Resources {
+            rock: 0,
+            wood: 0,
+            ore: 0,
+            fiber: 0,
+            hide: 0,
+        },
+        brecilien: 0,
+    }
+}
+
 #[cfg(test)]
 mod tests {
-    use super::MapRecord;
+    use super::{slugify, MapRecord};
     use serde_json::json;
+    use std::sync::Arc;
 
     #[test]
     fn map_record_accepts_legacy_type_and_serializes_map_type() {
@@ -88,4 +162,49 @@ mod tests {
         assert!(serialized.get("type").is_none());
         assert_eq!(serialized["chests"]["highGold"], 3);
     }
+
+    #[test]
+    fn parse_all_decodes_bytes_and_derives_slugs() {
+        let records = MapRecord::parse_all(
+            br#"[{
+                "name": " Casos Aiagsum ",
+                "tier": "T4",
+                "type": "TUNNEL_ROYAL",
+                "chests": { "blue": 0, "green": 0, "highGold": 0, "lowGold": 0 },
+                "dungeons": { "solo": 0, "group": 0, "avalon": 0 },
+                "resources": { "rock": 0, "wood": 0, "ore": 0, "fiber": 0, "hide": 0 },
+                "brecilien": 0
+            }]"#,
+        )
+        .expect("maps payload should parse");
+
+        assert_eq!(records.len(), 1);
+        assert_eq!(records[0].slug, "casos-aiagsum");
+        assert_eq!(&*records[0].map_type, "TUNNEL_ROYAL");
+    }
+
+    #[test]
+    fn parse_all_shares_repeated_tier_and_type_strings() {
+        let entry = r#"{
+            "name": "Casos-Aiagsum",
+            "tier": "T4",
+            "type": "TUNNEL_ROYAL",
+            "chests": { "blue": 0, "green": 0, "highGold": 0, "lowGold": 0 },
+            "dungeons": { "solo": 0, "group": 0, "avalon": 0 },
+            "resources": { "rock": 0, "wood": 0, "ore": 0, "fiber": 0, "hide": 0 },
+            "brecilien": 0
+        }"#;
+        let payload = format!("[{},{}]", entry, entry);
+        let records = MapRecord::parse_all(payload.as_bytes()).expect("maps payload should parse");
+
+        assert!(Arc::ptr_eq(&records[0].tier, &records[1].tier));
+        assert!(Arc::ptr_eq(&records[0].map_type, &records[1].map_type));
+    }
+
+    #[test]
+    fn slugify_matches_trim_lowercase_hyphenate() {
+        for name in ["Ouyos-Aoeuam", " Casos Aiagsum ", "CASOS  AIAGSUM"] {
+            assert_eq!(slugify(name), name.trim().to_lowercase().replace(" ", "-"));
+        }
+    }
 }
@@ -1,12 +1,23 @@
 use crate::models::config::AppConfig;
 use crate::utils::capture;
+use crate::utils::debug_image;
 use crate::utils::frozen_screen::FrozenScreenState;
 use crate::utils::logger;
 use std::path::PathBuf;
 use std::str::FromStr;
 use std::sync::Arc;
 use tauri::{AppHandle, Emitter, Manager, WebviewUrl, WebviewWindowBuilder};
-use tauri_plugin_global_shortcut::{GlobalShortcutExt, Shortcut, ShortcutState};
+use tauri_plugin_global_shortcut::{GlobalShortcutExt, Shortcut, ShortcutEvent, ShortcutState};
+
+/// Frontend modifier spellings and the names the shortcut parser expects
+const MODIFIER_ALIASES: [(&str, &str); 6] = [
+    ("control", "ctrl"),
+    ("cmd", "super"),
+    ("command", "super"),
+    ("meta", "super"),
+    ("win", "super"),
+    ("windows", "super"),
+];
 
 pub struct HotkeyService;
 
@@ -25,10 +36,11 @@ impl HotkeyService {
             return Err("Mouse OCR hotkey and region OCR hotkey cannot be the same".to_string());
         }
 
-        // Validate before replacing existing registrations.
-        Shortcut::from_str(&mouse_hotkey)
+        // Validate before replacing existing registrations; the parsed shortcuts are
+        // registered directly so each combo is only parsed once.
+        let mouse_shortcut = Shortcut::from_str(&mouse_hotkey)
             .map_err(|e| format!("Invalid mouse OCR hotkey '{}': {}", config.mouse_hotkey, e))?;
-        Shortcut::from_str(&region_hotkey)
+        let region_shortcut = Shortcut::from_str(&region_hotkey)
             .map_err(|e| format!("Invalid region OCR hotkey '{}': {}", config.chat_hotkey, e))?;
 
         println!(
@@ -49,16 +61,9 @@ impl HotkeyService {
             .map_err(|e| format!("Failed to clear existing shortcuts: {}", e))?;
 
         // Register mouse OCR shortcut
-        let app1 = app_handle.clone();
         app_handle
             .global_shortcut()
-            .on_shortcut(mouse_hotkey.as_str(), move |_app, _shortcut, event| {
-                if event.state == ShortcutState::Pressed {
-                    println!("HotkeyService: mouse OCR hotkey pressed!");
-                    logger::info("hotkey", "mouse OCR hotkey pressed");
-                    let _ = app1.emit("hotkey-mouse-ocr", ());
-                }
-            })
+            .on_shortcut(mouse_shortcut, Self::on_mouse_shortcut)
             .map_err(|e| {
                 format!(
                     "Failed to register mouse OCR hotkey '{}': {}",
@@ -69,18 +74,17 @@ impl HotkeyService {
         println!("HotkeyService: mouse OCR hotkey registered successfully");
 
         // Register region select OCR shortcut
-        let app2 = app_handle.clone();
         let region_logs_dir = logs_dir.clone();
         let region_frozen_screen = frozen_screen.clone();
         app_handle
             .global_shortcut()
-            .on_shortcut(region_hotkey.as_str(), move |_app, _shortcut, event| {
+            .on_shortcut(region_shortcut, move |app, _shortcut, event| {
                 if event.state == ShortcutState::Pressed {
                     println!("HotkeyService: region OCR hotkey pressed!");
                     logger::info("hotkey", "region OCR hotkey pressed");
                     // Create fullscreen transparent overlay window for region selection
                     if let Err(e) = Self::create_region_selector_window(
-                        &app2,
+                        app,
                         &region_logs_dir,
                         &region_frozen_screen,
                         ocr_debug,
@@ -102,23 +106,41 @@ impl HotkeyService {
         Ok(())
     }
 
+    /// The mouse hotkey needs no captured state: the plugin hands over the app handle
+    fn on_mouse_shortcut(app: &AppHandle, _shortcut: &Shortcut, event: ShortcutEvent) {
+        if event.state == ShortcutState::Pressed {
+            println!("HotkeyService: mouse OCR hotkey pressed!");
+            logger::info("hotkey", "mouse OCR hotkey pressed");
+            let _ = app.emit("hotkey-mouse-ocr", ());
+        }
+    }
+
     fn normalize_hotkey(hotkey: &str) -> Result<String, String> {
-        let parts: Vec<String> = hotkey
+        let mut normalized = String::with_capacity(hotkey.len());
+
+        for part in hotkey
             .split('+')
-            .map(|part| part.trim().to_lowercase())
+            .map(str::trim)
             .filter(|part| !part.is_empty())
-            .map(|part| match part.as_str() {
-                "control" => "ctrl".to_string(),
-                "cmd" | "command" | "meta" | "win" | "windows" => "super".to_string(),
-                other => other.to_string(),
-            })
-            .collect();
+        {
+            if !normalized.is_empty() {
+                normalized.push('+');
+            }
+
+            match MODIFIER_ALIASES
+                .iter()
+                .find(|(alias, _)| alias.eq_ignore_ascii_case(part))
+            {
+                Some((_, canonical)) => normalized.push_str(canonical),
+                None => normalized.extend(part.chars().flat_map(char::to_lowercase)),
+            }
+        }
 
-        if parts.is_empty() {
+        if normalized.is_empty() {
             return Err("hotkey cannot be empty".to_string());
         }
 
-        Ok(parts.join("+"))
+        Ok(normalized)
     }
 
     /// Create a fullscreen transparent overlay window for region selection
@@ -217,14 +239,13 @@ impl HotkeyService {
             let mut path = logs_dir.clone();
             path.push("avalon_atlas_region_frozen.png");
 
-            captured
-                .image
-                .save(&path)
-                .map_err(|e| format!("Failed to save frozen screenshot: {}", e))?;
-            logger::info(
-                "region-selector",
-                format!("saved frozen screenshot debug copy {:?}", path),
-            );
+            // Encoding happens on the debug writer so the overlay opens right away
+            if debug_image::save_in_background(path.clone(), captured.image.clone()) {
+                logger::info(
+                    "region-selector",
+                    format!("queued frozen screenshot debug copy {:?}", path),
+                );
+            }
         } else {
             logger::info(
                 "region-selector",
@@ -252,5 +273,10 @@ mod tests {
             HotkeyService::normalize_hotkey("ctrl+win+w").unwrap(),
             "ctrl+super+w"
         );
+        assert_eq!(
+            HotkeyService::normalize_hotkey(" Control + + Windows+F4 ").unwrap(),
+            "ctrl+super+f4"
+        );
+        assert!(HotkeyService::normalize_hotkey(" + ").is_err());
     }
 }
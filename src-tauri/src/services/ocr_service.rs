@@ -1,14 +1,22 @@
-use crate::models::config::AppConfig;
+use crate::models::config::{AppConfig, OcrRegion};
 use crate::models::map::SearchResult;
-use crate::services::search_engine::SearchEngine;
+use crate::services::search_engine::{
+    joined_looks_like_full_map_query, looks_like_full_map_query, SearchEngine,
+};
 use crate::utils::capture;
 use crate::utils::logger;
-use image::{DynamicImage, GrayImage, Luma};
+use image::{GrayImage, Luma};
+use std::borrow::Cow;
+use std::collections::hash_map::DefaultHasher;
+use std::collections::HashMap;
+use std::hash::{Hash, Hasher};
 #[cfg(target_os = "windows")]
 use std::os::windows::process::CommandExt;
 use std::path::PathBuf;
+use std::process::Command;
+use std::sync::atomic::{AtomicBool, Ordering};
 use std::sync::Arc;
-use std::sync::{Mutex, RwLock};
+use std::sync::{Mutex, OnceLock, RwLock};
 use tauri::{AppHandle, Manager};
 
 pub struct OcrService {
@@ -16,91 +24,274 @@ pub struct OcrService {
     app_handle: Mutex<Option<AppHandle>>,
     config: Arc<RwLock<AppConfig>>,
     logs_dir: PathBuf,
+    /// Resolved (tesseract binary, tessdata dir), fixed for the process lifetime
+    tesseract_paths: OnceLock<(String, String)>,
+    /// Raw tesseract text -> extracted maps, so re-triggering on the same screen is a lookup
+    extracted: RwLock<HashMap<String, Vec<SearchResult>>>,
+    /// Pixel hash of a grayscale crop -> raw tesseract text, so an unchanged region
+    /// never launches tesseract again
+    recognized: RwLock<HashMap<u64, String>>,
+    /// Set while a mouse OCR run is in flight; repeated hotkey presses are dropped
+    mouse_ocr_running: AtomicBool,
+}
+
+/// Clears the in-flight flag when a mouse OCR run ends, including on early return
+struct MouseOcrRun<'a>(&'a AtomicBool);
+
+impl Drop for MouseOcrRun<'_> {
+    fn drop(&mut self) {
+        self.0.store(false, Ordering::Release);
+    }
 }
 
 /// OCR character correction mapping (same as Python version)
 /// Maps commonly misrecognized characters to their correct equivalents
-fn apply_ocr_char_fixes(text: &str) -> String {
-    text.chars()
-        .map(|c| match c {
-            '0' => 'o',
-            '1' | '|' | '¡' => 'l',
-            '2' => 'z',
-            '3' => 'e',
-            '4' => 'a',
-            '5' => 's',
-            '6' | '8' => 'b',
-            '7' => 't',
-            '9' => 'g',
-            _ => c,
-        })
-        .collect()
+const fn fix_ocr_char(c: char) -> char {
+    match c {
+        '0' => 'o',
+        '1' | '|' | '¡' => 'l',
+        '2' => 'z',
+        '3' => 'e',
+        '4' => 'a',
+        '5' => 's',
+        '6' | '8' => 'b',
+        '7' => 't',
+        '9' => 'g',
+        _ => c,
+    }
 }
 
-/// Preprocess image to improve OCR accuracy (same as Python version)
-/// Steps: Convert to grayscale, enhance contrast, sharpen
-fn preprocess_image(img: DynamicImage) -> DynamicImage {
-    // 1. Convert to grayscale
-    let gray = img.to_luma8();
+/// What a char contributes to normalized text: its lowercased, OCR-fixed ASCII
+/// letter or digit, or 0 when it only separates words
+const fn fold_char(ch: char) -> u8 {
+    let ch = fix_ocr_char(ch.to_ascii_lowercase());
+    if ch.is_ascii_alphanumeric() {
+        ch as u8
+    } else {
+        0
+    }
+}
 
-    // 2. Enhance contrast (simple linear stretch)
-    let contrast_enhanced = enhance_contrast(&gray, 2.0);
+/// `fold_char` for every ASCII char, so OCR output costs one lookup per byte
+const ASCII_FOLD: [u8; 128] = {
+    let mut table = [0u8; 128];
+    let mut byte = 0;
+    while byte < 128 {
+        table[byte] = fold_char(byte as u8 as char);
+        byte += 1;
+    }
+    table
+};
+
+/// `ASCII_PART_FOLD` entry for the bytes that split raw OCR text into candidates
+const PART_BREAK: u8 = u8::MAX;
+
+/// `ASCII_FOLD` with whitespace and `,;|` marked as `PART_BREAK`, so splitting and
+/// normalizing share one lookup per byte
+const ASCII_PART_FOLD: [u8; 128] = {
+    let mut table = ASCII_FOLD;
+    let mut byte = 0;
+    while byte < 128 {
+        if matches!(
+            byte as u8,
+            b' ' | b'\t' | b'\n' | b'\x0b' | b'\x0c' | b'\r' | b',' | b';' | b'|'
+        ) {
+            table[byte] = PART_BREAK;
+        }
+        byte += 1;
+    }
+    table
+};
+
+/// Builds a `normalize_text` result one lowercased char at a time: OCR lookalikes are
+/// fixed and every run of other characters collapses into a single '-'
+#[derive(Default)]
+struct TextNormalizer {
+    normalized: String,
+    last_was_separator: bool,
+}
 
-    // 3. Sharpen (using a simple unsharp mask approximation)
-    let sharpened = sharpen_image(&contrast_enhanced);
+impl TextNormalizer {
+    fn with_capacity(capacity: usize) -> Self {
+        Self {
+            normalized: String::with_capacity(capacity),
+            last_was_separator: false,
+        }
+    }
 
-    DynamicImage::ImageLuma8(sharpened)
+    fn push(&mut self, ch: char) {
+        self.push_folded(if ch.is_ascii() {
+            ASCII_FOLD[ch as usize]
+        } else {
+            fold_char(ch)
+        });
+    }
+
+    /// Push a `fold_char` result
+    fn push_folded(&mut self, folded: u8) {
+        if folded != 0 {
+            self.normalized.push(folded as char);
+            self.last_was_separator = false;
+        } else if !self.normalized.is_empty() && !self.last_was_separator {
+            self.normalized.push('-');
+            self.last_was_separator = true;
+        }
+    }
+
+    fn finish(mut self) -> String {
+        // Leading separators are never pushed, so only a trailing one can remain
+        if self.last_was_separator {
+            self.normalized.pop();
+        }
+        self.normalized
+    }
 }
 
-/// Enhance contrast by a factor
-fn enhance_contrast(img: &GrayImage, factor: f32) -> GrayImage {
-    let (width, height) = img.dimensions();
-    let mut result = GrayImage::new(width, height);
+/// Feed the lowercased chars of `text` to `f`
+fn for_each_lowercase(text: &str, mut f: impl FnMut(char)) {
+    // Tesseract output is almost always ASCII, which lowercases byte by byte
+    if text.is_ascii() {
+        text.bytes()
+            .for_each(|byte| f(byte.to_ascii_lowercase() as char));
+    } else {
+        text.chars().flat_map(char::to_lowercase).for_each(f);
+    }
+}
+
+/// Split raw OCR text on whitespace and `,;|`, normalizing every part in the same pass
+fn normalized_parts(text: &str) -> Vec<String> {
+    let mut parts = Vec::new();
+    let mut current = TextNormalizer::default();
+    if text.is_ascii() {
+        for byte in text.bytes() {
+            match ASCII_PART_FOLD[byte as usize] {
+                PART_BREAK => parts.push(std::mem::take(&mut current).finish()),
+                folded => current.push_folded(folded),
+            }
+        }
+    } else {
+        for ch in text.chars().flat_map(char::to_lowercase) {
+            if ch.is_whitespace() || matches!(ch, ',' | ';' | '|') {
+                parts.push(std::mem::take(&mut current).finish());
+            } else {
+                current.push(ch);
+            }
+        }
+    }
+    parts.push(current.finish());
+    parts
+}
 
-    for (x, y, pixel) in img.enumerate_pixels() {
-        let value = pixel[0] as f32;
+/// Base tesseract invocation shared by every OCR path, printing text to stdout
+///
+/// The bundled eng.traineddata is the integer-quantized tessdata_fast model, so the
+/// LSTM engine is pinned; OpenMP threads only add startup cost on crops this small.
+fn tesseract_command(tess_path: &str, tess_data: &str, image_path: &str) -> Command {
+    let mut command = Command::new(tess_path);
+    command
+        .arg(image_path)
+        .arg("stdout")
+        .arg("-l")
+        .arg("eng")
+        .arg("--tessdata-dir")
+        .arg(tess_data)
+        .arg("--oem")
+        .arg("1")
+        // config to disable dictionary
+        .arg("-c")
+        .arg("load_system_dawg=0")
+        .arg("-c")
+        .arg("load_freq_dawg=0")
+        .env("OMP_THREAD_LIMIT", "1")
+        // Hide window on Windows
+        .creation_flags(0x08000000); // CREATE_NO_WINDOW
+    command
+}
+
+/// Run a prepared tesseract command and return the text it printed
+fn run_tesseract(command: &mut Command, scope: &str) -> Result<String, String> {
+    let output = command
+        .output()
+        .map_err(|e| format!("Failed to execute tesseract: {}", e))?;
+
+    if !output.status.success() {
+        let stderr = String::from_utf8_lossy(&output.stderr);
+        logger::error(scope, format!("tesseract failed: {}", stderr));
+        return Err(format!("Tesseract execution failed: {}", stderr));
+    }
+
+    String::from_utf8(output.stdout).map_err(|e| format!("Invalid UTF-8 output: {}", e))
+}
+
+/// Preprocess image to improve OCR accuracy (same as Python version)
+/// Steps: enhance contrast, sharpen; the crop arrives already in grayscale
+fn preprocess_image(mut gray: GrayImage) -> GrayImage {
+    // 1. Enhance contrast (simple linear stretch), in place
+    enhance_contrast(&mut gray, 2.0);
+
+    // 2. Sharpen (using a simple unsharp mask approximation), in place
+    sharpen_image(&mut gray);
+
+    gray
+}
+
+/// Enhance contrast by a factor
+fn enhance_contrast(img: &mut GrayImage, factor: f32) {
+    // Only 256 inputs are possible, so compute each once instead of per pixel
+    let mut table = [0u8; 256];
+    for (value, entry) in table.iter_mut().enumerate() {
         // Center around 128, apply factor, then shift back
-        let new_value = ((value - 128.0) * factor + 128.0).clamp(0.0, 255.0) as u8;
-        result.put_pixel(x, y, Luma([new_value]));
+        *entry = ((value as f32 - 128.0) * factor + 128.0).clamp(0.0, 255.0) as u8;
     }
 
-    result
+    for value in img.iter_mut() {
+        *value = table[*value as usize];
+    }
 }
 
-/// Simple sharpen filter using 3x3 kernel
-fn sharpen_image(img: &GrayImage) -> GrayImage {
-    let (width, height) = img.dimensions();
-    let mut result = GrayImage::new(width, height);
+/// Simple sharpen filter using 3x3 kernel, in place; border pixels are kept
+fn sharpen_image(img: &mut GrayImage) {
+    let (width, height) = (img.width() as usize, img.height() as usize);
+    if width < 3 || height < 3 {
+        return;
+    }
 
     // Sharpen kernel: center = 5, edges = -1
     // [0, -1, 0]
     // [-1, 5, -1]
     // [0, -1, 0]
 
-    for y in 1..height.saturating_sub(1) {
-        for x in 1..width.saturating_sub(1) {
-            let center = img.get_pixel(x, y)[0] as i32 * 5;
-            let top = img.get_pixel(x, y - 1)[0] as i32;
-            let bottom = img.get_pixel(x, y + 1)[0] as i32;
-            let left = img.get_pixel(x - 1, y)[0] as i32;
-            let right = img.get_pixel(x + 1, y)[0] as i32;
-
-            let value = (center - top - bottom - left - right).clamp(0, 255) as u8;
-            result.put_pixel(x, y, Luma([value]));
+    // Rows are overwritten top to bottom, so keep the original of the row above
+    // and of the current row; the row below is still untouched when it is read
+    let pixels: &mut [u8] = img;
+    let mut above = pixels[..width].to_vec();
+    let mut current = vec![0u8; width];
+
+    for y in 1..height - 1 {
+        let (head, tail) = pixels.split_at_mut((y + 1) * width);
+        let row = &mut head[y * width..];
+        let below = &tail[..width];
+        current.copy_from_slice(row);
+
+        for x in 1..width - 1 {
+            let value = current[x] as i32 * 5
+                - above[x] as i32
+                - below[x] as i32
+                - current[x - 1] as i32
+                - current[x + 1] as i32;
+            row[x] = value.clamp(0, 255) as u8;
         }
-    }
 
-    // Copy edges
-    for x in 0..width {
-        result.put_pixel(x, 0, *img.get_pixel(x, 0));
-        result.put_pixel(x, height - 1, *img.get_pixel(x, height - 1));
-    }
-    for y in 0..height {
-        result.put_pixel(0, y, *img.get_pixel(0, y));
-        result.put_pixel(width - 1, y, *img.get_pixel(width - 1, y));
+        std::mem::swap(&mut above, &mut current);
     }
+}
 
-    result
+/// Identifies a crop by its exact pixels; OCR crops are small enough to hash whole
+fn pixel_hash(image: &GrayImage) -> u64 {
+    let mut hasher = DefaultHasher::new();
+    image.dimensions().hash(&mut hasher);
+    image.as_raw().hash(&mut hasher);
+    hasher.finish()
 }
 
 fn tesseract_compatible_path(path: PathBuf) -> PathBuf {
@@ -120,19 +311,6 @@ fn tesseract_compatible_path(path: PathBuf) -> PathBuf {
     path
 }
 
-fn looks_like_map_name_candidate(candidate: &str) -> bool {
-    let Some((left, right)) = candidate.split_once('-') else {
-        return false;
-    };
-
-    left.chars().filter(|ch| ch.is_ascii_alphanumeric()).count() >= 3
-        && right
-            .chars()
-            .filter(|ch| ch.is_ascii_alphanumeric())
-            .count()
-            >= 3
-}
-
 impl OcrService {
     pub fn new(
         search_engine: Arc<SearchEngine>,
@@ -144,6 +322,10 @@ impl OcrService {
             app_handle: Mutex::new(None),
             config,
             logs_dir,
+            tesseract_paths: OnceLock::new(),
+            extracted: RwLock::new(HashMap::new()),
+            recognized: RwLock::new(HashMap::new()),
+            mouse_ocr_running: AtomicBool::new(false),
         }
     }
 
@@ -153,6 +335,15 @@ impl OcrService {
     }
 
     fn get_tesseract_paths(&self) -> Result<(String, String), String> {
+        if let Some(paths) = self.tesseract_paths.get() {
+            return Ok(paths.clone());
+        }
+
+        let paths = self.resolve_tesseract_paths()?;
+        Ok(self.tesseract_paths.get_or_init(|| paths).clone())
+    }
+
+    fn resolve_tesseract_paths(&self) -> Result<(String, String), String> {
         let handle_guard = self.app_handle.lock().unwrap();
         let app = handle_guard.as_ref().ok_or("App handle not set")?;
 
@@ -207,6 +398,38 @@ impl OcrService {
         ))
     }
 
+    /// Resolve tesseract and run it once on a blank image, so the first hotkey
+    /// press does not pay for path lookup and cold-loading the language data
+    pub fn warm_up(&self) {
+        let started = std::time::Instant::now();
+        let result = self
+            .get_tesseract_paths()
+            .and_then(|(tess_path, tess_data)| {
+                let temp_path = std::env::temp_dir().join("avalon_atlas_warmup.png");
+                GrayImage::from_pixel(32, 32, Luma([255]))
+                    .save(&temp_path)
+                    .map_err(|e| format!("Failed to save warm-up image: {}", e))?;
+
+                let temp_path_str = temp_path.to_str().ok_or("Invalid temp path")?;
+                tesseract_command(&tess_path, &tess_data, temp_path_str)
+                    .arg("--psm")
+                    .arg("6")
+                    .output()
+                    .map_err(|e| format!("Failed to execute tesseract: {}", e))?;
+
+                let _ = std::fs::remove_file(&temp_path);
+                Ok(())
+            });
+
+        match result {
+            Ok(()) => logger::info(
+                "ocr.warmup",
+                format!("completed in {}ms", started.elapsed().as_millis()),
+            ),
+            Err(error) => logger::error("ocr.warmup", format!("failed: {}", error)),
+        }
+    }
+
     fn ocr_debug_enabled(&self) -> bool {
         self.config
             .read()
@@ -232,7 +455,9 @@ impl OcrService {
 
         // 1. Capture Screen
         let captured = capture::capture_primary_screen()?;
-        let image = captured.image;
+        // Text only needs luma, and a single channel quarters the bytes the PNG
+        // encoder and tesseract have to go through for a full screen
+        let image = image::imageops::grayscale(&captured.image);
         logger::info(
             "ocr.full",
             format!(
@@ -245,9 +470,6 @@ impl OcrService {
             ),
         );
 
-        // Convert to dynamic image for processing (optional later)
-        // let dynamic_image = DynamicImage::ImageRgba8(image);
-
         // 2. Save to temp file (robust way for Tesseract)
         let temp_path = self.capture_path("avalon_atlas_ocr.png".to_string())?;
 
@@ -280,31 +502,10 @@ impl OcrService {
         // But tesseract is a console app.
         // Since we are running from backend, it should be fine.
 
-        let output = std::process::Command::new(&tess_path)
-            .arg(temp_path_str)
-            .arg("stdout") // Output to stdout
-            .arg("-l")
-            .arg("eng")
-            .arg("--tessdata-dir")
-            .arg(&tess_data)
-            // config to disable dictionary
-            .arg("-c")
-            .arg("load_system_dawg=0")
-            .arg("-c")
-            .arg("load_freq_dawg=0")
-            // Hide window on Windows
-            .creation_flags(0x08000000) // CREATE_NO_WINDOW
-            .output()
-            .map_err(|e| format!("Failed to execute tesseract: {}", e))?;
-
-        if !output.status.success() {
-            let stderr = String::from_utf8_lossy(&output.stderr);
-            logger::error("ocr.full", format!("tesseract failed: {}", stderr));
-            return Err(format!("Tesseract execution failed: {}", stderr));
-        }
-
-        let text =
-            String::from_utf8(output.stdout).map_err(|e| format!("Invalid UTF-8 output: {}", e))?;
+        let text = run_tesseract(
+            &mut tesseract_command(&tess_path, &tess_data, temp_path_str),
+            "ocr.full",
+        )?;
 
         // 4. Search with the recognized text
         let clean_text = self.normalize_text(&text);
@@ -323,25 +524,13 @@ impl OcrService {
 
         let results = self.search_engine.search(&clean_text, 5);
         logger::info("ocr.full", format!("results={}", results.len()));
-        Ok(results)
+        Ok(results.to_vec())
     }
 
     fn normalize_text(&self, text: &str) -> String {
-        let fixed = apply_ocr_char_fixes(&text.to_lowercase());
-        let mut normalized = String::new();
-        let mut last_was_separator = false;
-
-        for ch in fixed.chars() {
-            if ch.is_ascii_alphanumeric() {
-                normalized.push(ch);
-                last_was_separator = false;
-            } else if !normalized.is_empty() && !last_was_separator {
-                normalized.push('-');
-                last_was_separator = true;
-            }
-        }
-
-        normalized.trim_matches('-').to_string()
+        let mut normalizer = TextNormalizer::with_capacity(text.len());
+        for_each_lowercase(text, |ch| normalizer.push(ch));
+        normalizer.finish()
     }
 
     /// Capture a region with mouse at bottom center (consistent with Python version)
@@ -355,22 +544,31 @@ impl OcrService {
         &self,
         mouse_x: i32,
         mouse_y: i32,
-        width: u32,
-        height: u32,
-        vertical_offset: i32,
+        region: OcrRegion,
     ) -> Result<Vec<SearchResult>, String> {
+        let Some(_run) = self.try_begin_mouse_ocr() else {
+            logger::info("ocr.mouse", "skipped: previous mouse OCR still running");
+            return Ok(Vec::new());
+        };
+
         // Mouse at bottom center: region is above the mouse
-        let x = mouse_x - (width as i32 / 2);
-        let y = mouse_y - height as i32 - vertical_offset; // Region is ABOVE mouse position
+        let (x, y) = region.origin_above(mouse_x, mouse_y);
         logger::info(
             "ocr.mouse",
             format!(
                 "computed capture region=({}, {}) {}x{} from cursor=({}, {}) vertical_offset={}",
-                x, y, width, height, mouse_x, mouse_y, vertical_offset
+                x, y, region.width, region.height, mouse_x, mouse_y, region.vertical_offset
             ),
         );
 
-        self.capture_custom_region(x, y, width, height)
+        self.capture_custom_region(x, y, region.width, region.height)
+    }
+
+    fn try_begin_mouse_ocr(&self) -> Option<MouseOcrRun<'_>> {
+        self.mouse_ocr_running
+            .compare_exchange(false, true, Ordering::Acquire, Ordering::Relaxed)
+            .ok()
+            .map(|_| MouseOcrRun(&self.mouse_ocr_running))
     }
 
     /// Capture a specific rectangular region
@@ -403,7 +601,7 @@ impl OcrService {
         );
 
         // Crop the image
-        let cropped = capture::crop_global(&captured, x, y, width, height).map_err(|e| {
+        let cropped = capture::crop_global_luma(&captured, x, y, width, height).map_err(|e| {
             logger::error("ocr.region", format!("failed to crop region: {}", e));
             e
         })?;
@@ -413,7 +611,7 @@ impl OcrService {
 
     pub fn ocr_region_image(
         &self,
-        cropped: image::RgbaImage,
+        cropped: GrayImage,
         x: i32,
         y: i32,
         width: u32,
@@ -435,8 +633,19 @@ impl OcrService {
             ),
         );
 
-        // Apply preprocessing (grayscale, contrast enhancement, sharpen)
-        let processed = preprocess_image(image::DynamicImage::ImageRgba8(cropped));
+        let pixels = pixel_hash(&cropped);
+        let cached_text = self
+            .recognized
+            .read()
+            .ok()
+            .and_then(|recognized| recognized.get(&pixels).cloned());
+        if let Some(text) = cached_text {
+            logger::info("ocr.region", "pixels unchanged; reusing tesseract text");
+            return self.extract_all_map_names(&text);
+        }
+
+        // Apply preprocessing (contrast enhancement, sharpen)
+        let processed = preprocess_image(cropped);
 
         // Save processed image to temp file
         let temp_path = self.capture_path(format!("avalon_atlas_region_{}_{}.png", x, y))?;
@@ -464,58 +673,66 @@ impl OcrService {
             ),
         );
 
-        let output = std::process::Command::new(&tess_path)
-            .arg(temp_path_str)
-            .arg("stdout")
-            .arg("-l")
-            .arg("eng")
-            .arg("--tessdata-dir")
-            .arg(&tess_data)
-            .arg("--psm")
-            .arg("6")
-            .arg("-c")
-            .arg("load_system_dawg=0")
-            .arg("-c")
-            .arg("load_freq_dawg=0")
-            .creation_flags(0x08000000)
-            .output()
-            .map_err(|e| format!("Failed to execute tesseract: {}", e))?;
-
-        if !output.status.success() {
-            let stderr = String::from_utf8_lossy(&output.stderr);
-            logger::error("ocr.region", format!("tesseract failed: {}", stderr));
-            return Err(format!("Tesseract execution failed: {}", stderr));
-        }
-
-        let text =
-            String::from_utf8(output.stdout).map_err(|e| format!("Invalid UTF-8 output: {}", e))?;
+        let text = run_tesseract(
+            tesseract_command(&tess_path, &tess_data, temp_path_str)
+                .arg("--psm")
+                .arg("6"),
+            "ocr.region",
+        )?;
         logger::info("ocr.region", format!("raw_text={:?}", text));
 
+        if let Ok(mut recognized) = self.recognized.write() {
+            if recognized.len() > 128 {
+                recognized.clear();
+            }
+            recognized.insert(pixels, text.clone());
+        }
+
         // Extract all possible map names from text
         self.extract_all_map_names(&text)
     }
 
     /// Extract multiple map names from OCR text
     fn extract_all_map_names(&self, text: &str) -> Result<Vec<SearchResult>, String> {
+        if let Ok(extracted) = self.extracted.read() {
+            if let Some(results) = extracted.get(text) {
+                logger::info(
+                    "ocr.extract",
+                    format!("cache hit final_results={}", results.len()),
+                );
+                return Ok(results.clone());
+            }
+        }
+
+        let results = self.match_map_names(text);
+
+        if let Ok(mut extracted) = self.extracted.write() {
+            if extracted.len() > 256 {
+                extracted.clear();
+            }
+            extracted.insert(text.to_string(), results.clone());
+        }
+
+        Ok(results)
+    }
+
+    fn match_map_names(&self, text: &str) -> Vec<SearchResult> {
         // Try to find all map names in the text. Split the raw OCR text first so
         // multi-line chat OCR does not get collapsed into one oversized query.
-        let mut all_results = Vec::new();
-        let mut seen_names = std::collections::HashSet::new();
-        let raw_parts: Vec<String> = text
-            .split(|c: char| c.is_whitespace() || matches!(c, ',' | ';' | '|'))
-            .map(|part| self.normalize_text(part))
-            .filter(|part| part.len() >= 3)
-            .collect();
-        let mut candidates: Vec<String> = raw_parts
+        let mut all_results: Vec<SearchResult> = Vec::new();
+        let mut raw_parts = normalized_parts(text);
+        raw_parts.retain(|part| part.len() >= 3);
+        // Single parts are borrowed; only joined pairs need a new string
+        let mut candidates: Vec<Cow<str>> = raw_parts
             .iter()
-            .filter(|candidate| looks_like_map_name_candidate(candidate))
-            .cloned()
+            .filter(|candidate| looks_like_full_map_query(candidate))
+            .map(|candidate| Cow::Borrowed(candidate.as_str()))
             .collect();
 
+        // Only pairs that already have the map shape are worth joining
         for pair in raw_parts.windows(2) {
-            let joined = format!("{}-{}", pair[0], pair[1]);
-            if looks_like_map_name_candidate(&joined) {
-                candidates.push(joined);
+            if joined_looks_like_full_map_query(&pair[0], &pair[1]) {
+                candidates.push(Cow::Owned(format!("{}-{}", pair[0], pair[1])));
             }
         }
 
@@ -524,7 +741,7 @@ impl OcrService {
                 "ocr.extract",
                 format!("no map-shaped candidates from raw_text={:?}", text),
             );
-            return Ok(Vec::new());
+            return Vec::new();
         }
 
         candidates.sort();
@@ -547,9 +764,12 @@ impl OcrService {
                 ),
             );
             if let Some(result) = result {
-                let key = format!("{}_{}", result.record.name, result.record.tier);
-                if !seen_names.contains(&key) {
-                    seen_names.insert(key);
+                // A capture only yields a handful of maps, so a scan beats hashing keys
+                let seen = all_results.iter().any(|existing| {
+                    existing.record.name == result.record.name
+                        && existing.record.tier == result.record.tier
+                });
+                if !seen {
                     all_results.push(result);
                 }
             }
@@ -560,46 +780,21 @@ impl OcrService {
             format!("final_results={}", all_results.len()),
         );
 
-        Ok(all_results)
+        all_results
     }
 }
 
 #[cfg(test)]
 mod tests {
-    use super::{looks_like_map_name_candidate, tesseract_compatible_path, OcrService};
+    use super::{
+        enhance_contrast, looks_like_full_map_query, normalized_parts, pixel_hash, sharpen_image,
+        tesseract_compatible_path, OcrService,
+    };
     use crate::models::config::AppConfig;
-    use crate::models::map::{Chests, Dungeons, MapRecord, Resources};
+    use crate::models::map::{test_record as record, MapRecord};
     use crate::services::search_engine::SearchEngine;
     use std::sync::{Arc, RwLock};
 
-    fn record(name: &str) -> MapRecord {
-        MapRecord {
-            name: name.to_string(),
-            slug: name.to_string(),
-            tier: "T4".to_string(),
-            map_type: "TUNNEL_ROYAL".to_string(),
-            chests: Chests {
-                blue: 0,
-                green: 0,
-                high_gold: 0,
-                low_gold: 0,
-            },
-            dungeons: Dungeons {
-                solo: 0,
-                group: 0,
-                avalon: 0,
-            },
-            resources: Resources {
-                rock: 0,
-                wood: 0,
-                ore: 0,
-                fiber: 0,
-                hide: 0,
-            },
-            brecilien: 0,
-        }
-    }
-
     fn service_with_records(records: Vec<MapRecord>) -> OcrService {
         OcrService::new(
             Arc::new(SearchEngine::new(records)),
@@ -618,6 +813,50 @@ mod tests {
 
         assert_eq!(service.normalize_text("C4S0S_AIAGSUM"), "casos-aiagsum");
         assert_eq!(service.normalize_text(" casos   aiagsum "), "casos-aiagsum");
+        assert_eq!(service.normalize_text("--Ça|s0s.."), "alsos");
+    }
+
+    #[test]
+    fn normalized_parts_split_before_fixing_pipes() {
+        assert_eq!(
+            normalized_parts("C4S0S_Aiagsum |Oynites, ;x"),
+            vec!["casos-aiagsum", "", "oynites", "", "", "x"]
+        );
+    }
+
+    #[test]
+    fn enhance_contrast_stretches_around_mid_grey() {
+        let mut image = image::GrayImage::from_raw(5, 1, vec![0, 100, 128, 200, 255]).unwrap();
+
+        enhance_contrast(&mut image, 2.0);
+
+        assert_eq!(image.into_raw(), vec![0, 72, 128, 255, 255]);
+    }
+
+    #[test]
+    fn sharpen_applies_the_kernel_inside_and_keeps_the_border() {
+        let mut image =
+            image::GrayImage::from_raw(3, 3, vec![0, 10, 0, 10, 100, 10, 0, 10, 0]).unwrap();
+        sharpen_image(&mut image);
+        assert_eq!(image.into_raw(), vec![0, 10, 0, 10, 255, 10, 0, 10, 0]);
+
+        // A linear ramp has no edges to sharpen
+        let ramp: Vec<u8> = (1..=12).map(|value| value * 10).collect();
+        let mut image = image::GrayImage::from_raw(4, 3, ramp.clone()).unwrap();
+        sharpen_image(&mut image);
+        assert_eq!(image.into_raw(), ramp);
+    }
+
+    #[test]
+    fn pixel_hash_tells_crops_apart_by_pixels_and_shape() {
+        let band = image::GrayImage::from_raw(4, 1, vec![0, 64, 128, 255]).unwrap();
+        let same = image::GrayImage::from_raw(4, 1, vec![0, 64, 128, 255]).unwrap();
+        let changed = image::GrayImage::from_raw(4, 1, vec![0, 64, 128, 254]).unwrap();
+        let reshaped = image::GrayImage::from_raw(2, 2, vec![0, 64, 128, 255]).unwrap();
+
+        assert_eq!(pixel_hash(&band), pixel_hash(&same));
+        assert_ne!(pixel_hash(&band), pixel_hash(&changed));
+        assert_ne!(pixel_hash(&band), pixel_hash(&reshaped));
     }
 
     #[test]
@@ -629,9 +868,9 @@ mod tests {
 
     #[test]
     fn map_name_candidate_filter_rejects_short_ocr_noise() {
-        assert!(looks_like_map_name_candidate("oynites-araosum"));
-        assert!(!looks_like_map_name_candidate("lao"));
-        assert!(!looks_like_map_name_candidate("tsp"));
+        assert!(looks_like_full_map_query("oynites-araosum"));
+        assert!(!looks_like_full_map_query("lao"));
+        assert!(!looks_like_full_map_query("tsp"));
     }
 
     #[test]
@@ -666,6 +905,33 @@ mod tests {
         assert!(results.is_empty());
     }
 
+    #[test]
+    fn extract_all_map_names_reuses_results_for_repeated_text() {
+        let service = service_with_records(vec![record("Oynites-Araosum")]);
+
+        let first = service
+            .extract_all_map_names("Oynites-Araosum")
+            .expect("map name should be matched");
+        let second = service
+            .extract_all_map_names("Oynites-Araosum")
+            .expect("cached map name should be matched");
+
+        assert_eq!(service.extracted.read().unwrap().len(), 1);
+        assert!(Arc::ptr_eq(&first[0].record, &second[0].record));
+    }
+
+    #[test]
+    fn mouse_ocr_runs_do_not_overlap() {
+        let service = service();
+
+        let first = service.try_begin_mouse_ocr();
+        assert!(first.is_some());
+        assert!(service.try_begin_mouse_ocr().is_none());
+
+        drop(first);
+        assert!(service.try_begin_mouse_ocr().is_some());
+    }
+
     #[test]
     fn extract_all_map_names_can_join_adjacent_ocr_words() {
         let service = service_with_records(vec![record("Oynites-Araosum")]);
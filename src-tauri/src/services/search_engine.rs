@@ -1,28 +1,149 @@
 use crate::models::map::{MapRecord, SearchResult};
-use crate::utils::fuzzy::subsequence_match;
+use crate::utils::fuzzy::{
+    canonicalize, char_mask, position_bonuses, subsequence_match_chars, MatchDetail,
+};
+use std::borrow::Cow;
 use std::collections::HashMap;
 use std::sync::{Arc, RwLock};
 
+/// Match targets computed once per record at load time
+struct MatchTarget {
+    /// `canonicalize`d name chars, as the subsequence matcher compares them
+    name: Vec<char>,
+    /// `canonicalize`d slug chars; `None` when they are identical to the name's
+    slug_match: Option<Vec<char>>,
+    /// Lowercased slug the OCR indexes are built from
+    slug: Vec<char>,
+    /// `char_mask` of the name and of the slug, to skip targets that cannot match
+    name_mask: u128,
+    slug_mask: u128,
+    /// `position_bonuses` of the name and of the slug; empty when there is no slug
+    name_bonuses: Vec<f64>,
+    slug_bonuses: Vec<f64>,
+}
+
+impl MatchTarget {
+    fn new(record: &MapRecord) -> Self {
+        let mut name: Vec<char> = record.name.to_lowercase().chars().collect();
+        let slug: Vec<char> = record.slug.trim().to_lowercase().chars().collect();
+
+        // Bonuses look at the lowercased text; matching only needs the folded chars
+        let name_bonuses = position_bonuses(&name);
+        canonicalize(&mut name);
+        let mut slug_match = slug.clone();
+        canonicalize(&mut slug_match);
+        let slug_match = (slug_match != name).then_some(slug_match);
+
+        Self {
+            name_mask: char_mask(&name),
+            slug_mask: char_mask(slug_match.as_deref().unwrap_or(&name)),
+            name_bonuses,
+            slug_bonuses: slug_match
+                .as_ref()
+                .map(|_| position_bonuses(&slug))
+                .unwrap_or_default(),
+            slug_match,
+            slug,
+            name,
+        }
+    }
+}
+
 pub struct SearchEngine {
-    records: Arc<Vec<MapRecord>>,
-    cache: Arc<RwLock<HashMap<(String, usize), Vec<SearchResult>>>>,
+    /// Kept in tier desc, name asc order, so indices double as score tie-breaks
+    records: Vec<Arc<MapRecord>>,
+    targets: Vec<MatchTarget>,
+    /// Normalized slug -> index of the first record carrying it
+    by_slug: HashMap<String, usize>,
+    /// Ordered canonical char pair -> indices of the records whose name or slug has
+    /// the first char somewhere before the second, once each
+    by_pair: HashMap<[char; 2], Vec<usize>>,
+    /// Slug trigram -> indices of the records containing it, once each
+    trigrams: HashMap<[char; 3], Vec<usize>>,
+    /// Slug length in chars -> indices of the records with that length
+    by_slug_len: Vec<Vec<usize>>,
+    cache: RwLock<HashMap<(String, usize), Arc<[SearchResult]>>>,
+    /// Lowercased query -> indices of every record it matched, before truncation
+    candidates: RwLock<HashMap<String, Arc<[usize]>>>,
+    /// Fuzzy OCR outcomes by normalized candidate, misses included
+    ocr_cache: RwLock<HashMap<String, Option<SearchResult>>>,
+    /// Slug with its hyphens removed -> its record; `None` when several slugs share it
+    by_compact_slug: HashMap<String, Option<usize>>,
 }
 
 impl SearchEngine {
-    pub fn new(records: Vec<MapRecord>) -> Self {
+    pub fn new(mut records: Vec<MapRecord>) -> Self {
+        // Stable, so records that tie on both keep their load order
+        records.sort_by(|a, b| b.tier.cmp(&a.tier).then_with(|| a.name.cmp(&b.name)));
+
+        // Build every per-record index in one pass over the loaded records
+        let mut shared = Vec::with_capacity(records.len());
+        let mut targets = Vec::with_capacity(records.len());
+        let mut by_slug = HashMap::with_capacity(records.len());
+        let mut by_compact_slug = HashMap::with_capacity(records.len());
+        let mut by_pair: HashMap<[char; 2], Vec<usize>> = HashMap::new();
+        let mut trigrams: HashMap<[char; 3], Vec<usize>> = HashMap::new();
+        let mut by_slug_len: Vec<Vec<usize>> = Vec::new();
+        for (index, record) in records.into_iter().enumerate() {
+            let target = MatchTarget::new(&record);
+            let slug_len = target.slug.len();
+            if by_slug_len.len() <= slug_len {
+                by_slug_len.resize_with(slug_len + 1, Vec::new);
+            }
+            by_slug_len[slug_len].push(index);
+            for chars in std::iter::once(&target.name).chain(target.slug_match.as_ref()) {
+                let mut earlier: Vec<char> = Vec::new();
+                for &ch in chars {
+                    for &first in &earlier {
+                        let postings = by_pair.entry([first, ch]).or_default();
+                        if postings.last() != Some(&index) {
+                            postings.push(index);
+                        }
+                    }
+                    if !earlier.contains(&ch) {
+                        earlier.push(ch);
+                    }
+                }
+            }
+            for window in target.slug.windows(3) {
+                let postings = trigrams
+                    .entry([window[0], window[1], window[2]])
+                    .or_default();
+                if postings.last() != Some(&index) {
+                    postings.push(index);
+                }
+            }
+            by_slug.entry(target.slug.iter().collect()).or_insert(index);
+            targets.push(target);
+            by_compact_slug
+                .entry(compact_slug(&record.slug))
+                .and_modify(|slot| *slot = None)
+                .or_insert(Some(index));
+            shared.push(Arc::new(record));
+        }
+
         Self {
-            records: Arc::new(records),
-            cache: Arc::new(RwLock::new(HashMap::new())),
+            records: shared,
+            targets,
+            by_slug,
+            by_pair,
+            trigrams,
+            by_slug_len,
+            cache: RwLock::new(HashMap::new()),
+            candidates: RwLock::new(HashMap::new()),
+            ocr_cache: RwLock::new(HashMap::new()),
+            by_compact_slug,
         }
     }
 
-    pub fn search(&self, query: &str, max_results: usize) -> Vec<SearchResult> {
+    pub fn search(&self, query: &str, max_results: usize) -> Arc<[SearchResult]> {
         let query_lower = query.trim().to_lowercase();
         if query_lower.chars().count() < 2 || max_results == 0 {
-            return vec![];
+            return Arc::from([]);
         }
 
-        let cache_key = (query_lower.clone(), max_results);
+        // The key owns the lowercased query; scoring below borrows it back
+        let cache_key = (query_lower, max_results);
 
         // Cache lookup
         {
@@ -32,36 +153,79 @@ impl SearchEngine {
             }
         }
 
-        let mut results: Vec<SearchResult> = vec![];
+        // Score against the parallel match targets first and only clone the
+        // records that survive the sort and truncation.
+        let mut hits: Vec<(usize, MatchDetail, &'static str)> = vec![];
+        let mut query_chars: Vec<char> = cache_key.0.chars().collect();
+        canonicalize(&mut query_chars);
+        let query_mask = char_mask(&query_chars);
+
+        // Extending a query only adds to the subsequence it must match, so a
+        // cached prefix's candidates are a superset of this query's matches.
+        // Without one, every match still holds each adjacent pair of query chars
+        // in order, which for two-char queries is exactly the match set.
+        let scope = self.cached_candidates(&cache_key.0);
+        let indices = match scope.as_deref() {
+            Some(indices) => indices,
+            None => self.rarest_pair_postings(&query_chars),
+        };
+
+        for &index in indices {
+            let target = &self.targets[index];
+            // Most records lack some query char, and are ruled out by one AND
+            if let Some(detail) = (query_mask & !target.name_mask == 0)
+                .then(|| subsequence_match_chars(&query_chars, &target.name, &target.name_bonuses))
+                .flatten()
+            {
+                hits.push((index, detail, "subsequence"));
+            } else if let Some(detail) = target
+                .slug_match
+                .as_deref()
+                .filter(|_| query_mask & !target.slug_mask == 0)
+                .and_then(|slug| subsequence_match_chars(&query_chars, slug, &target.slug_bonuses))
+            {
+                hits.push((index, detail, "slug_subsequence"));
+            }
+        }
 
-        for record in self.records.iter() {
-            if let Some(detail) = subsequence_match(&query_lower, &record.name) {
-                results.push(SearchResult {
-                    record: record.clone(),
-                    score: detail.score,
-                    method: "subsequence".to_string(),
-                    positions: Some(detail.positions),
-                });
-            } else if let Some(detail) = subsequence_match(&query_lower, &record.slug) {
-                results.push(SearchResult {
-                    record: record.clone(),
-                    score: detail.score,
-                    method: "slug_subsequence".to_string(),
-                    positions: Some(detail.positions),
-                });
+        {
+            let mut candidates = self.candidates.write().unwrap();
+            if candidates.len() > 1000 {
+                candidates.clear();
             }
+            candidates.insert(
+                cache_key.0.clone(),
+                hits.iter().map(|(index, _, _)| *index).collect(),
+            );
         }
 
-        // Sort by score desc, then tier desc
-        results.sort_by(|a, b| {
+        // Sort by score desc, then tier desc and name, which is index order; the
+        // distinct indices keep the order total so the unstable sorts agree with
+        // a stable one
+        let by_rank = |(a_index, a, _): &(usize, MatchDetail, &str),
+                       (b_index, b, _): &(usize, MatchDetail, &str)| {
             b.score
                 .partial_cmp(&a.score)
                 .unwrap_or(std::cmp::Ordering::Equal)
-                .then_with(|| b.record.tier.cmp(&a.record.tier))
-                .then_with(|| a.record.name.cmp(&b.record.name))
-        });
+                .then_with(|| a_index.cmp(b_index))
+        };
 
-        results.truncate(max_results);
+        // Short queries match most records; only the kept ones need ordering
+        if hits.len() > max_results {
+            hits.select_nth_unstable_by(max_results - 1, by_rank);
+            hits.truncate(max_results);
+        }
+        hits.sort_unstable_by(by_rank);
+
+        let results: Arc<[SearchResult]> = hits
+            .into_iter()
+            .map(|(index, detail, method)| SearchResult {
+                record: self.records[index].clone(),
+                score: detail.score,
+                method,
+                positions: Some(detail.positions),
+            })
+            .collect();
 
         // Update cache
         {
@@ -76,33 +240,105 @@ impl SearchEngine {
         results
     }
 
+    /// Candidates of the longest cached query that `query` starts with, itself included
+    fn cached_candidates(&self, query: &str) -> Option<Arc<[usize]>> {
+        let candidates = self.candidates.read().unwrap();
+        std::iter::once(query.len())
+            .chain(query.char_indices().rev().map(|(end, _)| end))
+            .filter(|&end| end > 0)
+            .find_map(|end| candidates.get(&query[..end]).cloned())
+    }
+
+    /// Shortest `by_pair` posting list among adjacent canonical `query_chars`
+    fn rarest_pair_postings(&self, query_chars: &[char]) -> &[usize] {
+        query_chars
+            .windows(2)
+            .map(|pair| {
+                self.by_pair
+                    .get(&[pair[0], pair[1]])
+                    .map_or(&[][..], Vec::as_slice)
+            })
+            .min_by_key(|postings| postings.len())
+            .unwrap_or_default()
+    }
+
     pub fn search_ocr_candidate(&self, query: &str) -> Option<SearchResult> {
-        let query = query.trim().to_lowercase();
+        let query = normalize_ocr_query(query);
         if !looks_like_full_map_query(&query) {
             return None;
         }
 
-        let mut best: Option<SearchResult> = None;
-        let mut second_best_score: f64 = 0.0;
+        // An exact slug always wins outright, no need to rank the rest
+        if let Some(&index) = self.by_slug.get(&*query) {
+            return Some(SearchResult {
+                record: self.records[index].clone(),
+                score: 1.0,
+                method: "ocr_exact",
+                positions: None,
+            });
+        }
 
-        for record in self.records.iter() {
-            let candidate = record.slug.trim().to_lowercase();
-            let distance = levenshtein_distance(&query, &candidate);
-            let max_len = query.chars().count().max(candidate.chars().count()) as f64;
-            if max_len == 0.0 {
-                continue;
+        // OCR often drops, adds or moves a hyphen; the letters alone still pin
+        // down a single slug without ranking the rest. It is held to the same
+        // edit budget and reports the same similarity as the ranked path.
+        if let Some(&Some(index)) = self.by_compact_slug.get(&compact_slug(&query)) {
+            let query_chars: Vec<char> = query.chars().collect();
+            let slug = &self.targets[index].slug;
+            let distance = levenshtein_distance(&query_chars, slug);
+            let max_len = query_chars.len().max(slug.len());
+            if distance <= ocr_edit_budget(max_len) {
+                return Some(SearchResult {
+                    record: self.records[index].clone(),
+                    score: 1.0 - (distance as f64 / max_len as f64),
+                    method: "ocr_compact",
+                    positions: None,
+                });
             }
+        }
 
-            let similarity = 1.0 - (distance as f64 / max_len);
-            let accepted = if query == candidate {
-                true
-            } else {
-                distance <= 2 && similarity >= 0.84
-            };
+        // Garbage OCR text tends to come back on every capture, so misses are
+        // remembered as well as matches
+        if let Some(cached) = self.ocr_cache.read().unwrap().get(&*query) {
+            return cached.clone();
+        }
 
-            if !accepted {
-                continue;
+        let result = self.rank_ocr_candidate(&query);
+        {
+            let mut ocr_cache = self.ocr_cache.write().unwrap();
+            if ocr_cache.len() > 1000 {
+                ocr_cache.clear();
             }
+            ocr_cache.insert(query.into_owned(), result.clone());
+        }
+
+        result
+    }
+
+    /// Best slug within the OCR edit budget, if it clearly beats the runner-up
+    fn rank_ocr_candidate(&self, query: &str) -> Option<SearchResult> {
+        let query_chars: Vec<char> = query.chars().collect();
+        let pattern = PatternMasks::new(&query_chars);
+        // The edit budget only depends on the longer of the two lengths, and the
+        // shortlist only holds slugs within two chars of the query
+        let budgets: [usize; 5] = std::array::from_fn(|offset| {
+            ocr_edit_budget(query_chars.len() + offset.saturating_sub(2))
+        });
+        let mut best: Option<SearchResult> = None;
+        let mut second_best_score: f64 = 0.0;
+
+        for index in self.ocr_shortlist(&query_chars) {
+            let record = &self.records[index];
+            let candidate = &self.targets[index].slug;
+            let budget = budgets[candidate.len() + 2 - query_chars.len()];
+            let distance = match &pattern {
+                Some(pattern) => pattern.distance_within(candidate, budget),
+                None => Some(levenshtein_distance(&query_chars, candidate)),
+            };
+            let Some(distance) = distance.filter(|&distance| distance <= budget) else {
+                continue;
+            };
+            let max_len = query_chars.len().max(candidate.len()) as f64;
+            let similarity = 1.0 - (distance as f64 / max_len);
 
             if best
                 .as_ref()
@@ -112,7 +348,7 @@ impl SearchEngine {
                 if let Some(current) = best.replace(SearchResult {
                     record: record.clone(),
                     score: similarity,
-                    method: "ocr_exact".to_string(),
+                    method: "ocr_exact",
                     positions: None,
                 }) {
                     second_best_score = second_best_score.max(current.score);
@@ -129,25 +365,193 @@ impl SearchEngine {
 
         Some(best)
     }
+
+    /// Records that can still be within edit distance 2 of the query, in index order
+    ///
+    /// Slugs more than two chars longer or shorter are never looked at. Each edit
+    /// also destroys at most three trigrams, so a slug within distance 2 shares at
+    /// least `trigram_count - 6` of the query's trigrams, when that bound is positive.
+    fn ocr_shortlist(&self, query_chars: &[char]) -> Vec<usize> {
+        let len = query_chars.len();
+        let mut shortlist: Vec<usize> = (len.saturating_sub(2)..=len + 2)
+            .filter_map(|slug_len| self.by_slug_len.get(slug_len))
+            .flatten()
+            .copied()
+            .collect();
+        shortlist.sort_unstable();
+
+        let required = len.saturating_sub(2 + 6);
+        if required == 0 {
+            return shortlist;
+        }
+
+        let mut shared = vec![0usize; self.records.len()];
+        for window in query_chars.windows(3) {
+            if let Some(postings) = self.trigrams.get(&[window[0], window[1], window[2]]) {
+                for &index in postings {
+                    shared[index] += 1;
+                }
+            }
+        }
+
+        shortlist.retain(|&index| shared[index] >= required);
+        shortlist
+    }
 }
 
-fn looks_like_full_map_query(query: &str) -> bool {
-    let Some((left, right)) = query.split_once('-') else {
-        return false;
-    };
+/// Trimmed, lowercased slug without its hyphens
+fn compact_slug(slug: &str) -> String {
+    slug.trim()
+        .chars()
+        .filter(|&ch| ch != '-')
+        .flat_map(char::to_lowercase)
+        .collect()
+}
+
+/// Most edits an OCR candidate may be away from a slug when the longer of the
+/// two is `max_len` chars: at most two, and only while similarity stays >= 0.84
+fn ocr_edit_budget(max_len: usize) -> usize {
+    (1..=2)
+        .rev()
+        .find(|&distance| 1.0 - (distance as f64 / max_len as f64) >= 0.84)
+        .unwrap_or(0)
+}
 
-    left.chars().filter(|ch| ch.is_ascii_alphanumeric()).count() >= 3
-        && right
-            .chars()
-            .filter(|ch| ch.is_ascii_alphanumeric())
-            .count()
-            >= 3
+/// Trimmed, lowercased OCR candidate; OCR output is normally lowercase ASCII
+/// already, and is then borrowed as-is instead of copied
+fn normalize_ocr_query(query: &str) -> Cow<'_, str> {
+    let query = query.trim();
+    if query.is_ascii() && !query.bytes().any(|byte| byte.is_ascii_uppercase()) {
+        Cow::Borrowed(query)
+    } else {
+        Cow::Owned(query.to_lowercase())
+    }
 }
 
-fn levenshtein_distance(left: &str, right: &str) -> usize {
-    let left: Vec<char> = left.chars().collect();
-    let right: Vec<char> = right.chars().collect();
+/// Both halves of a `xxx-yyy` map name carry at least three alphanumerics
+pub fn looks_like_full_map_query(query: &str) -> bool {
+    map_shaped(query.bytes())
+}
 
+/// `looks_like_full_map_query` of `left-right`, without building the joined string
+pub fn joined_looks_like_full_map_query(left: &str, right: &str) -> bool {
+    map_shaped(
+        left.bytes()
+            .chain(std::iter::once(b'-'))
+            .chain(right.bytes()),
+    )
+}
+
+fn map_shaped(bytes: impl Iterator<Item = u8>) -> bool {
+    // One forward pass over the bytes: count alphanumerics before the first '-',
+    // then after it, and stop as soon as both sides have enough.
+    let mut left = 0;
+    let mut right = 0;
+    let mut seen_separator = false;
+
+    for byte in bytes {
+        if !seen_separator && byte == b'-' {
+            if left < 3 {
+                return false;
+            }
+            seen_separator = true;
+        } else if byte.is_ascii_alphanumeric() {
+            if seen_separator {
+                right += 1;
+                if right >= 3 {
+                    return true;
+                }
+            } else {
+                left += 1;
+            }
+        }
+    }
+
+    false
+}
+
+/// Per-char match bitmasks of a query, for Myers' bit-parallel edit distance
+struct PatternMasks {
+    ascii: [u64; 128],
+    other: Vec<(char, u64)>,
+    last_bit: u64,
+    len: usize,
+}
+
+impl PatternMasks {
+    /// `None` when the pattern is empty or does not fit in one 64-bit word
+    fn new(pattern: &[char]) -> Option<Self> {
+        if pattern.is_empty() || pattern.len() > 64 {
+            return None;
+        }
+
+        let mut masks = Self {
+            ascii: [0; 128],
+            other: Vec::new(),
+            last_bit: 1 << (pattern.len() - 1),
+            len: pattern.len(),
+        };
+        for (i, &ch) in pattern.iter().enumerate() {
+            let bit = 1u64 << i;
+            if ch.is_ascii() {
+                masks.ascii[ch as usize] |= bit;
+            } else if let Some(entry) = masks.other.iter_mut().find(|(other, _)| *other == ch) {
+                entry.1 |= bit;
+            } else {
+                masks.other.push((ch, bit));
+            }
+        }
+
+        Some(masks)
+    }
+
+    fn mask(&self, ch: char) -> u64 {
+        if ch.is_ascii() {
+            return self.ascii[ch as usize];
+        }
+        self.other
+            .iter()
+            .find(|(other, _)| *other == ch)
+            .map_or(0, |&(_, bit)| bit)
+    }
+
+    /// Levenshtein distance from the pattern to `text`, one column per char,
+    /// or `None` as soon as it is certain to end up above `max_distance`
+    fn distance_within(&self, text: &[char], max_distance: usize) -> Option<usize> {
+        let mut positive = !0u64;
+        let mut negative = 0u64;
+        let mut distance = self.len;
+
+        for (column, &ch) in text.iter().enumerate() {
+            let eq = self.mask(ch);
+            let vertical = eq | negative;
+            let horizontal = (((eq & positive).wrapping_add(positive)) ^ positive) | eq;
+            let mut horizontal_pos = negative | !(horizontal | positive);
+            let mut horizontal_neg = positive & horizontal;
+
+            if horizontal_pos & self.last_bit != 0 {
+                distance += 1;
+            } else if horizontal_neg & self.last_bit != 0 {
+                distance -= 1;
+            }
+
+            horizontal_pos = (horizontal_pos << 1) | 1;
+            horizontal_neg <<= 1;
+            positive = horizontal_neg | !(vertical | horizontal_pos);
+            negative = horizontal_pos & vertical;
+
+            // Each remaining char can lower the distance by at most one
+            let remaining = text.len() - column - 1;
+            if distance > max_distance.saturating_add(remaining) {
+                return None;
+            }
+        }
+
+        Some(distance)
+    }
+}
+
+fn levenshtein_distance(left: &[char], right: &[char]) -> usize {
     let mut previous: Vec<usize> = (0..=right.len()).collect();
     let mut current = vec![0; right.len() + 1];
 
@@ -169,36 +573,14 @@ fn levenshtein_distance(left: &str, right: &str) -> usize {
 
 #[cfg(test)]
 mod tests {
-    use super::SearchEngine;
-    use crate::models::map::{Chests, Dungeons, MapRecord, Resources};
-
-    fn record(name: &str) -> MapRecord {
-        MapRecord {
-            name: name.to_string(),
-            slug: name.to_string(),
-            tier: "T4".to_string(),
-            map_type: "TUNNEL_ROYAL".to_string(),
-            chests: Chests {
-                blue: 0,
-                green: 0,
-                high_gold: 0,
-                low_gold: 0,
-            },
-            dungeons: Dungeons {
-                solo: 0,
-                group: 0,
-                avalon: 0,
-            },
-            resources: Resources {
-                rock: 0,
-                wood: 0,
-                ore: 0,
-                fiber: 0,
-                hide: 0,
-            },
-            brecilien: 0,
-        }
-    }
+    use super::{
+        compact_slug, joined_looks_like_full_map_query, levenshtein_distance,
+        looks_like_full_map_query, normalize_ocr_query, ocr_edit_budget, PatternMasks,
+        SearchEngine,
+    };
+    use crate::models::map::test_record as record;
+    use crate::utils::fuzzy::canonicalize;
+    use std::borrow::Cow;
 
     #[test]
     fn cache_keeps_queries_with_different_limits_separate() {
@@ -215,6 +597,107 @@ mod tests {
         assert_eq!(expanded.len(), 3);
     }
 
+    #[test]
+    fn limited_search_keeps_the_head_of_the_full_ranking() {
+        let engine = SearchEngine::new(vec![
+            record("casos-aiagsum"),
+            record("oynites-araosum"),
+            record("casos-aximam"),
+            record("qiient-al-odetum"),
+            record("casos-ayosrom"),
+        ]);
+        let names = |limit: usize| -> Vec<String> {
+            engine
+                .search("as", limit)
+                .iter()
+                .map(|result| result.record.name.clone())
+                .collect()
+        };
+
+        let full = names(10);
+        assert_eq!(full.len(), 4);
+        for limit in 1..=4 {
+            assert_eq!(names(limit), full[..limit]);
+        }
+    }
+
+    #[test]
+    fn search_breaks_score_ties_by_tier_then_name() {
+        let mut t6 = record("casos-aiagsum");
+        t6.tier = "T6".into();
+        let engine = SearchEngine::new(vec![record("casos-aiagsum"), t6, record("casos-aiagsun")]);
+
+        let results = engine.search("casos-aiags", 3);
+        let order: Vec<(&str, &str)> = results
+            .iter()
+            .map(|result| (&*result.record.tier, result.record.name.as_str()))
+            .collect();
+
+        assert_eq!(
+            order,
+            vec![
+                ("T6", "casos-aiagsum"),
+                ("T4", "casos-aiagsum"),
+                ("T4", "casos-aiagsun"),
+            ]
+        );
+    }
+
+    #[test]
+    fn extended_query_rescores_only_the_prefix_candidates() {
+        let maps = || {
+            vec![
+                record("casos-aiagsum"),
+                record("casos-aximam"),
+                record("oynites-araosum"),
+                record("qiient-al-odetum"),
+            ]
+        };
+        let warm = SearchEngine::new(maps());
+        warm.search("as", 1);
+
+        let candidates: Vec<usize> = warm.cached_candidates("aso").unwrap().to_vec();
+        assert_eq!(candidates, vec![0, 1, 2]);
+
+        let summary = |engine: &SearchEngine, query: &str| -> Vec<(String, f64)> {
+            engine
+                .search(query, 10)
+                .iter()
+                .map(|result| (result.record.name.clone(), result.score))
+                .collect()
+        };
+        for query in ["aso", "asos-ax", "ca", "zz", "zzq"] {
+            assert_eq!(
+                summary(&warm, query),
+                summary(&SearchEngine::new(maps()), query),
+                "{query}"
+            );
+        }
+        assert!(warm.cached_candidates("zzq-al").unwrap().is_empty());
+    }
+
+    #[test]
+    fn cold_search_scans_only_the_rarest_query_char_pair() {
+        let engine = SearchEngine::new(vec![
+            record("casos-aiagsum"),
+            record("casos-aximam"),
+            record("oynites-araosum"),
+        ]);
+        let query = |text: &str| {
+            let mut chars: Vec<char> = text.chars().collect();
+            canonicalize(&mut chars);
+            chars
+        };
+
+        assert_eq!(engine.rarest_pair_postings(&query("sx")), &[1]);
+        assert_eq!(engine.rarest_pair_postings(&query("c0s")), &[0, 1]);
+        assert_eq!(engine.rarest_pair_postings(&query("ss")), &[0, 1, 2]);
+        assert!(engine.rarest_pair_postings(&query("mx")).is_empty());
+        assert!(engine.rarest_pair_postings(&query("sq")).is_empty());
+        assert_eq!(engine.search("cxm", 10).len(), 1);
+        assert!(engine.search("sq", 10).is_empty());
+    }
+
     #[test]
     fn search_ignores_trimmed_queries_shorter_than_two_chars() {
         let engine = SearchEngine::new(vec![record("casos-aiagsum")]);
@@ -231,4 +714,185 @@ mod tests {
         assert!(engine.search_ocr_candidate("bes").is_none());
         assert!(engine.search_ocr_candidate("s-obayal").is_none());
     }
+
+    #[test]
+    fn ocr_candidate_matches_slugs_regardless_of_hyphens() {
+        let engine = SearchEngine::new(vec![
+            record("Casos-Aiagsum"),
+            record("ab-cdef"),
+            record("abc-def"),
+        ]);
+
+        let result = engine.search_ocr_candidate("caso-saiagsum").unwrap();
+        assert_eq!(result.record.name, "Casos-Aiagsum");
+        assert_eq!(result.method, "ocr_compact");
+        // One hyphen removed and one inserted: two edits over 13 chars
+        assert_eq!(result.score, 1.0 - 2.0 / 13.0);
+
+        let result = engine.search_ocr_candidate("casosaiag-sum").unwrap();
+        assert_eq!(result.score, 1.0 - 2.0 / 13.0);
+
+        // Beyond the edit budget the letters alone are not enough
+        assert!(looks_like_full_map_query("cas-osa-iagsum"));
+        assert_eq!(
+            compact_slug("cas-osa-iagsum"),
+            compact_slug("caso-saiagsum")
+        );
+        assert!(engine.search_ocr_candidate("cas-osa-iagsum").is_none());
+        assert_eq!(engine.by_compact_slug["abcdef"], None);
+    }
+
+    #[test]
+    fn ocr_candidate_remembers_misses() {
+        let engine = SearchEngine::new(vec![record("Oynites-Araosum")]);
+
+        assert!(engine.search_ocr_candidate("Casos-Aiagsum").is_none());
+        assert!(engine.search_ocr_candidate("oynites-araosurn").is_some());
+        assert!(engine.search_ocr_candidate(" casos-aiagsum ").is_none());
+
+        let ocr_cache = engine.ocr_cache.read().unwrap();
+        assert_eq!(ocr_cache.len(), 2);
+        assert!(ocr_cache["casos-aiagsum"].is_none());
+    }
+
+    #[test]
+    fn ocr_query_is_only_copied_when_it_needs_lowercasing() {
+        assert!(matches!(
+            normalize_ocr_query(" casos-aiagsum "),
+            Cow::Borrowed("casos-aiagsum")
+        ));
+        assert_eq!(normalize_ocr_query("Casos-Aiagsum"), "casos-aiagsum");
+        assert_eq!(normalize_ocr_query("ÇASOS"), "çasos");
+    }
+
+    #[test]
+    fn map_shape_counts_alphanumerics_around_the_first_hyphen() {
+        assert!(looks_like_full_map_query("oynites-araosum"));
+        assert!(looks_like_full_map_query("a.b.c--x_y_z"));
+        assert!(looks_like_full_map_query("qiient-al-vynsom"));
+        assert!(!looks_like_full_map_query("ab-cdef"));
+        assert!(!looks_like_full_map_query("abc-d-e"));
+        assert!(!looks_like_full_map_query("abcdef"));
+        assert!(!looks_like_full_map_query("çaé-ééé"));
+    }
+
+    #[test]
+    fn joined_map_shape_matches_the_joined_string() {
+        let parts = [
+            "", "ab", "abc", "oynites", "ab-c", "abc-", "-xyz", "a-bcdef",
+        ];
+        for left in parts {
+            for right in parts {
+                assert_eq!(
+                    joined_looks_like_full_map_query(left, right),
+                    looks_like_full_map_query(&format!("{}-{}", left, right)),
+                    "{:?} + {:?}",
+                    left,
+                    right
+                );
+            }
+        }
+    }
+
+    #[test]
+    fn bit_parallel_distance_matches_the_dp_table() {
+        let words = [
+            "casos-aiagsum",
+            "casos-aiagsun",
+            "caso-aiagsum",
+            "oynites-araosurn",
+            "oynites-araosum",
+            "qiient-al-vynsom",
+            "ééa-b",
+            "a",
+            "",
+        ];
+        for left in words {
+            let left: Vec<char> = left.chars().collect();
+            let Some(pattern) = PatternMasks::new(&left) else {
+                continue;
+            };
+            for right in words {
+                let right: Vec<char> = right.chars().collect();
+                assert_eq!(
+                    pattern.distance_within(&right, usize::MAX),
+                    Some(levenshtein_distance(&left, &right))
+                );
+            }
+        }
+    }
+
+    #[test]
+    fn bit_parallel_distance_gives_up_past_the_cutoff() {
+        let query: Vec<char> = "casos-aiagsum".chars().collect();
+        let pattern = PatternMasks::new(&query).unwrap();
+        let close: Vec<char> = "casos-aiagsun".chars().collect();
+        let far: Vec<char> = "oynites-araosum".chars().collect();
+
+        assert_eq!(pattern.distance_within(&close, 2), Some(1));
+        assert_eq!(pattern.distance_within(&far, 2), None);
+    }
+
+    #[test]
+    fn trigram_shortlist_keeps_close_slugs_and_drops_unrelated_ones() {
+        let engine = SearchEngine::new(vec![
+            record("oynites-araosum"),
+            record("casos-aiagsum"),
+            record("qiient-al-vynsom"),
+        ]);
+        let query: Vec<char> = "0ynites-araos0m".chars().collect();
+
+        let shortlist = engine.ocr_shortlist(&query);
+
+        assert_eq!(shortlist.len(), 1);
+        assert_eq!(engine.records[shortlist[0]].name, "oynites-araosum");
+        assert!(engine.ocr_shortlist(&['a', 'b', 'c']).is_empty());
+        assert!(engine.search_ocr_candidate("oynites-ara0sum").is_some());
+    }
+
+    #[test]
+    fn ocr_shortlist_only_keeps_slugs_within_two_chars_of_the_query() {
+        let engine = SearchEngine::new(vec![
+            record("abc-de"),
+            record("abc-def-gh"),
+            record("abc-defg"),
+            record("ab-cd"),
+        ]);
+        let query: Vec<char> = "abc-def".chars().collect();
+        let names: Vec<&str> = engine
+            .ocr_shortlist(&query)
+            .into_iter()
+            .map(|index| engine.records[index].name.as_str())
+            .collect();
+
+        assert_eq!(names, vec!["ab-cd", "abc-de", "abc-defg"]);
+    }
+
+    #[test]
+    fn ocr_edit_budget_follows_the_similarity_threshold() {
+        for max_len in 1..40 {
+            let expected = (0..=2)
+                .filter(|&distance| {
+                    distance == 0 || 1.0 - (distance as f64 / max_len as f64) >= 0.84
+                })
+                .max()
+                .unwrap();
+            assert_eq!(ocr_edit_budget(max_len), expected, "max_len={}", max_len);
+        }
+        assert_eq!(ocr_edit_budget(6), 0);
+        assert_eq!(ocr_edit_budget(7), 1);
+        assert_eq!(ocr_edit_budget(13), 2);
+    }
+
+    #[test]
+    fn ocr_candidate_prefers_exact_slug_over_close_neighbours() {
+        let engine = SearchEngine::new(vec![record("casos-aiagsun"), record("casos-aiagsum")]);
+
+        let result = engine
+            .search_ocr_candidate("Casos-Aiagsum")
+            .expect("exact slug should match");
+
+        assert_eq!(result.record.name, "casos-aiagsum");
+        assert_eq!(result.score, 1.0);
+    }
 }
@@ -1,6 +1,11 @@
 use crate::utils::logger;
-use image::RgbaImage;
+use image::{GrayImage, RgbaImage};
 use screenshots::Screen;
+use std::sync::atomic::{AtomicBool, Ordering};
+
+/// Set once the screenshots backend has returned a black frame; later captures go
+/// straight to ScreenDC instead of paying for a wasted full-screen grab each time
+static PREFER_SCREENDC: AtomicBool = AtomicBool::new(false);
 
 #[derive(Clone)]
 pub struct CapturedScreen {
@@ -11,28 +16,39 @@ pub struct CapturedScreen {
 }
 
 pub fn capture_primary_screen() -> Result<CapturedScreen, String> {
-    let screen = Screen::all()
+    capture_with_fallback(primary_screen)
+}
+
+/// Windows always places the primary monitor's top-left corner at (0, 0), so it can
+/// be looked up directly instead of querying every attached display per capture
+#[cfg(target_os = "windows")]
+fn primary_screen() -> Result<Screen, String> {
+    Screen::from_point(0, 0).map_err(|e| e.to_string())
+}
+
+#[cfg(not(target_os = "windows"))]
+fn primary_screen() -> Result<Screen, String> {
+    Screen::all()
         .map_err(|e| e.to_string())?
         .into_iter()
         .find(|screen| screen.display_info.is_primary)
-        .ok_or("No primary screen found")?;
-
-    capture_with_fallback(screen)
+        .ok_or_else(|| "No primary screen found".to_string())
 }
 
 pub fn capture_screen_containing_point(x: i32, y: i32) -> Result<CapturedScreen, String> {
-    let screen = Screen::from_point(x, y).map_err(|e| e.to_string())?;
-
-    capture_with_fallback(screen)
+    capture_with_fallback(|| Screen::from_point(x, y).map_err(|e| e.to_string()))
 }
 
-pub fn crop_global(
+/// Crop a region given in global coordinates, converting it to grayscale on the way
+///
+/// OCR only ever reads luma, so the RGBA pixels are never copied out on their own.
+pub fn crop_global_luma(
     capture: &CapturedScreen,
     x: i32,
     y: i32,
     width: u32,
     height: u32,
-) -> Result<RgbaImage, String> {
+) -> Result<GrayImage, String> {
     let local_x = x - capture.origin_x;
     let local_y = y - capture.origin_y;
     let local_x = local_x.max(0) as u32;
@@ -44,30 +60,44 @@ pub fn crop_global(
         return Err("Invalid capture region dimensions".to_string());
     }
 
-    Ok(image::DynamicImage::ImageRgba8(capture.image.clone())
-        .crop_imm(local_x, local_y, width, height)
-        .to_rgba8())
+    // Read only the cropped pixels through a view, never the whole screen
+    let view = image::imageops::crop_imm(&capture.image, local_x, local_y, width, height);
+    Ok(image::imageops::grayscale(&*view))
 }
 
-fn capture_with_fallback(screen: Screen) -> Result<CapturedScreen, String> {
+/// `find_screen` is only called when the screenshots backend is actually used
+fn capture_with_fallback(
+    find_screen: impl FnOnce() -> Result<Screen, String>,
+) -> Result<CapturedScreen, String> {
+    if PREFER_SCREENDC.load(Ordering::Relaxed) {
+        match capture_screendc() {
+            Ok(captured) if !looks_black(&captured.image) => return Ok(captured),
+            _ => logger::info(
+                "capture",
+                "preferred ScreenDC capture unusable, trying screenshots again",
+            ),
+        }
+    }
+
+    let screen = find_screen()?;
     let origin_x = screen.display_info.x;
     let origin_y = screen.display_info.y;
     let image = screen.capture().map_err(|e| e.to_string())?;
-    let black_ratio = dark_pixel_ratio(&image);
+    let black = looks_black(&image);
 
     logger::info(
         "capture",
         format!(
-            "screenshots capture method=screenshots origin=({}, {}) size={}x{} black_ratio={:.3}",
+            "screenshots capture method=screenshots origin=({}, {}) size={}x{} black={}",
             origin_x,
             origin_y,
             image.width(),
             image.height(),
-            black_ratio
+            black
         ),
     );
 
-    if black_ratio < 0.97 {
+    if !black {
         return Ok(CapturedScreen {
             image,
             origin_x,
@@ -80,25 +110,30 @@ fn capture_with_fallback(screen: Screen) -> Result<CapturedScreen, String> {
         "capture",
         "screenshots capture looks black, falling back to ScreenDC",
     );
+    PREFER_SCREENDC.store(true, Ordering::Relaxed);
 
     capture_screendc()
 }
 
-fn dark_pixel_ratio(image: &RgbaImage) -> f32 {
-    let total = image.width().saturating_mul(image.height());
-    if total == 0 {
-        return 1.0;
-    }
+/// Whether at least 97% of the pixels are near-black
+///
+/// A normal frame is ruled out as soon as 3% of its pixels turn out to be lit, so
+/// only genuinely black captures pay for a scan of the whole frame.
+fn looks_black(image: &RgbaImage) -> bool {
+    let total = image.as_raw().len() / 4;
+    let max_lit = total - (total as f64 * 0.97).ceil() as usize;
+    let mut lit = 0;
 
-    let dark = image
-        .pixels()
-        .filter(|pixel| {
-            let [r, g, b, _] = pixel.0;
-            u16::from(r) + u16::from(g) + u16::from(b) < 24
-        })
-        .count();
+    for pixel in image.as_raw().chunks_exact(4) {
+        if u16::from(pixel[0]) + u16::from(pixel[1]) + u16::from(pixel[2]) >= 24 {
+            lit += 1;
+            if lit > max_lit {
+                return false;
+            }
+        }
+    }
 
-    dark as f32 / total as f32
+    true
 }
 
 #[cfg(target_os = "windows")]
@@ -203,16 +238,15 @@ fn capture_screendc() -> Result<CapturedScreen, String> {
 
         let image = RgbaImage::from_raw(width as u32, height as u32, bgra)
             .ok_or("ScreenDC image buffer has invalid dimensions")?;
-        let black_ratio = dark_pixel_ratio(&image);
         logger::info(
             "capture",
             format!(
-                "screendc capture origin=({}, {}) size={}x{} black_ratio={:.3}",
+                "screendc capture origin=({}, {}) size={}x{} black={}",
                 origin_x,
                 origin_y,
                 image.width(),
                 image.height(),
-                black_ratio
+                looks_black(&image)
             ),
         );
 
@@ -229,3 +263,42 @@ fn capture_screendc() -> Result<CapturedScreen, String> {
 fn capture_screendc() -> Result<CapturedScreen, String> {
     Err("ScreenDC fallback is only available on Windows".to_string())
 }
+
+#[cfg(test)]
+mod tests {
+    use super::{crop_global_luma, looks_black, CapturedScreen};
+    use image::{DynamicImage, RgbaImage};
+
+    #[test]
+    fn black_check_tolerates_a_few_lit_pixels() {
+        let mut image = RgbaImage::new(10, 10);
+        for x in 0..3 {
+            image.put_pixel(x, 0, image::Rgba([255, 255, 255, 255]));
+        }
+        assert!(looks_black(&image));
+
+        image.put_pixel(3, 0, image::Rgba([255, 255, 255, 255]));
+        assert!(!looks_black(&image));
+        assert!(looks_black(&RgbaImage::new(0, 0)));
+    }
+
+    #[test]
+    fn luma_crop_matches_cropping_then_converting() {
+        let image = RgbaImage::from_fn(6, 4, |x, y| {
+            image::Rgba([(x * 40) as u8, (y * 60) as u8, (x * y * 10) as u8, 255])
+        });
+        let captured = CapturedScreen {
+            image: image.clone(),
+            origin_x: -2,
+            origin_y: 1,
+            method: "test",
+        };
+
+        let cropped = crop_global_luma(&captured, -1, 2, 3, 2).unwrap();
+        let expected =
+            DynamicImage::ImageRgba8(image::imageops::crop_imm(&image, 1, 1, 3, 2).to_image())
+                .to_luma8();
+
+        assert_eq!(cropped, expected);
+    }
+}
@@ -0,0 +1,77 @@
+use crate::utils::logger;
+use image::codecs::png::{CompressionType, FilterType, PngEncoder};
+use image::{ColorType, ImageEncoder, RgbaImage};
+use std::fs::File;
+use std::io::BufWriter;
+use std::path::{Path, PathBuf};
+use std::sync::mpsc::{self, SyncSender, TrySendError};
+use std::sync::OnceLock;
+
+/// Debug screenshots waiting for the writer thread; saves beyond this are dropped
+const QUEUE_CAPACITY: usize = 4;
+
+/// PNG encoding a full screen takes long enough to be felt on a hotkey press,
+/// so debug copies are handed to a background writer instead.
+static DEBUG_WRITER: OnceLock<Option<SyncSender<(PathBuf, RgbaImage)>>> = OnceLock::new();
+
+/// Queue `image` to be written to `path`; returns false when it was dropped
+pub fn save_in_background(path: PathBuf, image: RgbaImage) -> bool {
+    let Some(sender) = DEBUG_WRITER.get_or_init(spawn_writer) else {
+        return false;
+    };
+
+    match sender.try_send((path, image)) {
+        Ok(()) => true,
+        Err(TrySendError::Full((path, _))) => {
+            logger::error(
+                "debug-image",
+                format!("writer busy, dropped debug copy {:?}", path),
+            );
+            false
+        }
+        Err(TrySendError::Disconnected((path, _))) => {
+            logger::error(
+                "debug-image",
+                format!("writer stopped, dropped debug copy {:?}", path),
+            );
+            false
+        }
+    }
+}
+
+fn spawn_writer() -> Option<SyncSender<(PathBuf, RgbaImage)>> {
+    let (sender, receiver) = mpsc::sync_channel::<(PathBuf, RgbaImage)>(QUEUE_CAPACITY);
+    let spawned = std::thread::Builder::new()
+        .name("debug-image".to_string())
+        .spawn(move || {
+            for (path, image) in receiver {
+                match write_png(&path, &image) {
+                    Ok(()) => logger::info("debug-image", format!("saved {:?}", path)),
+                    Err(e) => {
+                        logger::error("debug-image", format!("failed to save {:?}: {}", path, e))
+                    }
+                }
+            }
+        });
+
+    match spawned {
+        Ok(_) => Some(sender),
+        Err(e) => {
+            logger::error("debug-image", format!("failed to start writer: {}", e));
+            None
+        }
+    }
+}
+
+/// Debug copies are only looked at by eye, so favour encode speed over file size
+fn write_png(path: &Path, image: &RgbaImage) -> Result<(), String> {
+    let file = File::create(path).map_err(|e| e.to_string())?;
+    PngEncoder::new_with_quality(BufWriter::new(file), CompressionType::Fast, FilterType::Sub)
+        .write_image(
+            image.as_raw(),
+            image.width(),
+            image.height(),
+            ColorType::Rgba8,
+        )
+        .map_err(|e| e.to_string())
+}
@@ -39,11 +39,13 @@ impl FrozenScreenState {
     }
 
     pub fn to_data_url(&self) -> Result<String, String> {
-        let captured = self.current()?;
         let mut bytes = Vec::new();
-        image::DynamicImage::ImageRgba8(captured.image)
-            .write_to(&mut Cursor::new(&mut bytes), ImageOutputFormat::Png)
-            .map_err(|e| format!("编码冻结图片失败: {}", e))?;
+        self.with_current(|captured| {
+            captured
+                .image
+                .write_to(&mut Cursor::new(&mut bytes), ImageOutputFormat::Png)
+                .map_err(|e| format!("编码冻结图片失败: {}", e))
+        })?;
 
         logger::info(
             "region-selector",
@@ -59,26 +61,31 @@ impl FrozenScreenState {
         y: i32,
         width: u32,
         height: u32,
-    ) -> Result<image::RgbaImage, String> {
-        let captured = self.current()?;
-        logger::info(
-            "region-selector",
-            format!(
-                "crop frozen screen region=({}, {}) {}x{} origin=({}, {})",
-                x, y, width, height, captured.origin_x, captured.origin_y
-            ),
-        );
-        capture::crop_global(&captured, x, y, width, height)
+    ) -> Result<image::GrayImage, String> {
+        self.with_current(|captured| {
+            logger::info(
+                "region-selector",
+                format!(
+                    "crop frozen screen region=({}, {}) {}x{} origin=({}, {})",
+                    x, y, width, height, captured.origin_x, captured.origin_y
+                ),
+            );
+            capture::crop_global_luma(captured, x, y, width, height)
+        })
     }
 
-    fn current(&self) -> Result<CapturedScreen, String> {
+    /// Borrow the stored screen under the lock instead of cloning the full frame
+    fn with_current<T>(
+        &self,
+        f: impl FnOnce(&CapturedScreen) -> Result<T, String>,
+    ) -> Result<T, String> {
         let guard = self
             .capture
             .lock()
             .map_err(|_| "Failed to lock frozen screen state".to_string())?;
-        guard
+        let captured = guard
             .as_ref()
-            .cloned()
-            .ok_or("没有可用的冻结截图，请重新触发框选 OCR".to_string())
+            .ok_or("没有可用的冻结截图，请重新触发框选 OCR".to_string())?;
+        f(captured)
     }
 }
@@ -12,83 +12,177 @@ const WORD_START_BONUS: f64 = 8.0;
 const START_OF_STRING_BONUS: f64 = 4.0;
 const GAP_PENALTY: f64 = 2.0;
 
-/// similar chars mapping
-fn chars_match(ch1: char, ch2: char) -> bool {
-    canonical_char(ch1) == canonical_char(ch2)
+fn canonical_char(ch: char) -> char {
+    if ch.is_ascii() {
+        return CANONICAL_ASCII[ch as usize] as char;
+    }
+
+    match ch {
+        '¡' => 'l',
+        other => other,
+    }
 }
 
-fn canonical_char(ch: char) -> char {
-    match ch.to_ascii_lowercase() {
-        '1' | '|' | '¡' | 'i' | 'l' => 'l',
-        '0' | 'o' => 'o',
-        '5' | 's' => 's',
-        '2' | 'z' => 'z',
-        '4' | 'a' => 'a',
-        '3' | 'e' => 'e',
-        '6' | '8' | 'b' => 'b',
-        '7' | 't' => 't',
-        '9' | 'g' => 'g',
+/// Canonical form of every ASCII char, resolved once at compile time
+static CANONICAL_ASCII: [u8; 128] = build_canonical_ascii();
+
+const fn build_canonical_ascii() -> [u8; 128] {
+    let mut table = [0u8; 128];
+    let mut byte = 0;
+    while byte < 128 {
+        table[byte] = canonical_ascii(byte as u8);
+        byte += 1;
+    }
+    table
+}
+
+const fn canonical_ascii(byte: u8) -> u8 {
+    match byte.to_ascii_lowercase() {
+        b'1' | b'|' | b'i' | b'l' => b'l',
+        b'0' | b'o' => b'o',
+        b'5' | b's' => b's',
+        b'2' | b'z' => b'z',
+        b'4' | b'a' => b'a',
+        b'3' | b'e' => b'e',
+        b'6' | b'8' | b'b' => b'b',
+        b'7' | b't' => b't',
+        b'9' | b'g' => b'g',
         other => other,
     }
 }
 
+/// Replace each char by the canonical form of its look-alike group, so matching
+/// compares chars with plain equality
+pub fn canonicalize(chars: &mut [char]) {
+    chars.iter_mut().for_each(|ch| *ch = canonical_char(*ch));
+}
+
+/// Set of canonical chars in `chars`, one bit per ASCII canonical char and bit 0
+/// shared by everything else
+///
+/// A query can only match a target whose mask covers the query's mask, which lets
+/// callers with precomputed target masks skip the scoring table entirely.
+pub fn char_mask(chars: &[char]) -> u128 {
+    chars.iter().fold(0, |mask, &ch| {
+        let canonical = canonical_char(ch);
+        mask | 1u128
+            << if canonical.is_ascii() {
+                canonical as u32
+            } else {
+                0
+            }
+    })
+}
+
+#[cfg(test)]
 pub fn subsequence_match(query: &str, candidate: &str) -> Option<MatchDetail> {
-    let query = query.trim().to_lowercase();
-    let candidate = candidate.to_lowercase();
+    let mut query_chars: Vec<char> = query.trim().to_lowercase().chars().collect();
+    let mut target_chars: Vec<char> = candidate.to_lowercase().chars().collect();
+    let bonuses = position_bonuses(&target_chars);
+    canonicalize(&mut query_chars);
+    canonicalize(&mut target_chars);
+
+    subsequence_match_chars(&query_chars, &target_chars, &bonuses)
+}
+
+/// Per-position base scores of a match target; they only depend on the target, so
+/// callers that match the same target repeatedly compute them once
+pub fn position_bonuses(target_chars: &[char]) -> Vec<f64> {
+    (0..target_chars.len())
+        .map(|j| position_bonus(target_chars, j))
+        .collect()
+}
+
+/// Same as `subsequence_match`, for callers that keep `canonicalize`d chars and the
+/// `position_bonuses` of the lowercased target around
+pub fn subsequence_match_chars(
+    query_chars: &[char],
+    target_chars: &[char],
+    bonuses: &[f64],
+) -> Option<MatchDetail> {
+    if query_chars.is_empty() || target_chars.is_empty() {
+        return None;
+    }
 
-    if query.is_empty() || candidate.is_empty() {
+    if query_chars.len() > target_chars.len() {
         return None;
     }
 
-    if query.len() > candidate.len() {
+    // Most targets that survive the char mask still fail on order, and a greedy
+    // scan says so without allocating the scoring tables
+    if !is_subsequence(query_chars, target_chars) {
         return None;
     }
 
-    let m = query.len();
-    let n = candidate.len();
-    let query_chars: Vec<char> = query.chars().collect();
-    let target_chars: Vec<char> = candidate.chars().collect();
-    let original_chars: Vec<char> = candidate.chars().collect(); // For is_word_start check if needed
+    let m = query_chars.len();
+    let n = target_chars.len();
 
-    // dp[i][j] stores the best score matching query[0..=i] ending at candidate[j]
-    let mut dp = vec![vec![f64::NEG_INFINITY; n]; m];
-    let mut backtrack = vec![vec![-1i32; n]; m];
+    // dp[i * n + j] stores the best score matching query[0..=i] ending at candidate[j];
+    // both tables are flat row-major buffers to keep each row contiguous
+    let mut dp = vec![f64::NEG_INFINITY; m * n];
+    let mut backtrack = vec![-1i32; m * n];
 
     // Initialize first row
     for j in 0..n {
-        if chars_match(query_chars[0], target_chars[j]) {
-            dp[0][j] = score_position(&original_chars, j, None);
+        if query_chars[0] == target_chars[j] {
+            dp[j] = score_position(bonuses[j], j, None);
         }
     }
 
     // Check if first char matched at all
-    // Optimization: if max(dp[0]) is NEG_INFINITY, return None early
+    // Optimization: if max of row 0 is NEG_INFINITY, return None early
 
+    // Every non-adjacent predecessor k of j scores
+    // prev_row[k] + k * GAP_PENALTY + (terms that only depend on j), so the best one
+    // can be carried along as a running max instead of rescanning 0..j for each j.
+    // Only the adjacent predecessor j - 1 scores differently and is checked on its own.
     for i in 1..m {
+        let (done_rows, rest_rows) = dp.split_at_mut(i * n);
+        let prev_row = &done_rows[(i - 1) * n..];
+        let row = &mut rest_rows[..n];
+        let backtrack_row = &mut backtrack[i * n..(i + 1) * n];
+
+        let mut far_best = f64::NEG_INFINITY;
+        let mut far_prev: Option<usize> = None;
+        let mut next_k = 0;
+
         for j in i..n {
-            if !chars_match(query_chars[i], target_chars[j]) {
+            // Fold every k < j - 1 into the running max, keeping the earliest on ties
+            while next_k + 1 < j {
+                let prev_score = prev_row[next_k];
+                if prev_score != f64::NEG_INFINITY {
+                    let key = prev_score + next_k as f64 * GAP_PENALTY;
+                    if key > far_best {
+                        far_best = key;
+                        far_prev = Some(next_k);
+                    }
+                }
+                next_k += 1;
+            }
+
+            if query_chars[i] != target_chars[j] {
                 continue;
             }
 
             let mut best_score = f64::NEG_INFINITY;
             let mut best_prev = -1;
 
-            // Try to extend from any valid previous position k < j
-            for k in 0..j {
-                let prev_score = dp[i - 1][k];
-                if prev_score == f64::NEG_INFINITY {
-                    continue;
-                }
+            if let Some(k) = far_prev {
+                best_score = prev_row[k] + score_position(bonuses[j], j, Some(k));
+                best_prev = k as i32;
+            }
 
-                let current_score = prev_score + score_position(&original_chars, j, Some(k));
+            let adjacent_score = prev_row[j - 1];
+            if adjacent_score != f64::NEG_INFINITY {
+                let current_score = adjacent_score + score_position(bonuses[j], j, Some(j - 1));
                 if current_score > best_score {
                     best_score = current_score;
-                    best_prev = k as i32;
+                    best_prev = (j - 1) as i32;
                 }
             }
 
-            dp[i][j] = best_score;
-            backtrack[i][j] = best_prev;
+            row[j] = best_score;
+            backtrack_row[j] = best_prev;
         }
     }
 
@@ -96,8 +190,7 @@ pub fn subsequence_match(query: &str, candidate: &str) -> Option<MatchDetail> {
     let mut best_final_score = f64::NEG_INFINITY;
     let mut best_final_idx = -1;
 
-    for j in 0..n {
-        let s = dp[m - 1][j];
+    for (j, &s) in dp[(m - 1) * n..].iter().enumerate() {
         if s > best_final_score {
             best_final_score = s;
             best_final_idx = j as i32;
@@ -115,7 +208,7 @@ pub fn subsequence_match(query: &str, candidate: &str) -> Option<MatchDetail> {
     for i in (0..m).rev() {
         positions[i] = curr_idx;
         if i > 0 {
-            let prev = backtrack[i][curr_idx];
+            let prev = backtrack[i * n + curr_idx];
             if prev == -1 {
                 return None; // Should not happen if score is valid
             }
@@ -129,7 +222,16 @@ pub fn subsequence_match(query: &str, candidate: &str) -> Option<MatchDetail> {
     })
 }
 
-fn score_position(text: &[char], idx: usize, prev_idx: Option<usize>) -> f64 {
+/// Whether `query` occurs in `target` in order, taking each char's earliest match
+fn is_subsequence(query: &[char], target: &[char]) -> bool {
+    let mut remaining = target.iter();
+    query
+        .iter()
+        .all(|query_char| remaining.any(|target_char| target_char == query_char))
+}
+
+/// Score of matching at `idx` before any gap or adjacency adjustment
+fn position_bonus(text: &[char], idx: usize) -> f64 {
     let mut score = BASE_SCORE;
 
     if is_word_start(text, idx) {
@@ -139,6 +241,13 @@ fn score_position(text: &[char], idx: usize, prev_idx: Option<usize>) -> f64 {
         score += START_OF_STRING_BONUS;
     }
 
+    score
+}
+
+/// `bonus` is `position_bonus` at `idx`
+fn score_position(bonus: f64, idx: usize, prev_idx: Option<usize>) -> f64 {
+    let mut score = bonus;
+
     match prev_idx {
         None => {
             score -= (idx as f64) * GAP_PENALTY;
@@ -173,7 +282,10 @@ fn is_word_start(text: &[char], idx: usize) -> bool {
 
 #[cfg(test)]
 mod tests {
-    use super::subsequence_match;
+    use super::{
+        canonical_char, canonicalize, char_mask, is_subsequence, position_bonuses,
+        subsequence_match, subsequence_match_chars,
+    };
 
     #[test]
     fn matches_common_ocr_digit_confusions_in_query() {
@@ -188,4 +300,59 @@ mod tests {
 
         assert_eq!(result.positions, vec![0, 1, 5, 6, 7]);
     }
+
+    #[test]
+    fn char_slices_match_like_strings() {
+        let mut query: Vec<char> = "c4-Ai".chars().collect();
+        let mut target: Vec<char> = "casos-aiagsum".chars().collect();
+        let bonuses = position_bonuses(&target);
+        canonicalize(&mut query);
+        canonicalize(&mut target);
+        let result =
+            subsequence_match_chars(&query, &target, &bonuses).expect("query should match");
+
+        assert_eq!(result.positions, vec![0, 1, 5, 6, 7]);
+    }
+
+    #[test]
+    fn multibyte_query_chars_do_not_overrun_the_table() {
+        assert!(subsequence_match("¡a", "la").is_some());
+    }
+
+    #[test]
+    fn char_mask_covers_every_matchable_query() {
+        let mask = |text: &str| char_mask(&text.chars().collect::<Vec<_>>());
+        let target = mask("casos-aiagsum");
+
+        assert_eq!(mask("c4s0s") & !target, 0);
+        assert_eq!(mask("CA-AI") & !target, 0);
+        assert_ne!(mask("cax") & !target, 0);
+        assert_eq!(mask("¡a") & !mask("la"), 0);
+        assert_eq!(mask("é") & !mask("ü"), 0);
+    }
+
+    #[test]
+    fn greedy_subsequence_check_respects_order() {
+        let chars = |text: &str| {
+            let mut chars = text.chars().collect::<Vec<_>>();
+            canonicalize(&mut chars);
+            chars
+        };
+        let target = chars("casos-aiagsum");
+
+        assert!(is_subsequence(&chars("c4s0s"), &target));
+        assert!(is_subsequence(&chars("sum"), &target));
+        assert!(!is_subsequence(&chars("mus"), &target));
+        assert!(subsequence_match("mus", "casos-aiagsum").is_none());
+    }
+
+    #[test]
+    fn canonical_table_folds_case_and_ocr_lookalikes() {
+        assert_eq!(canonical_char('I'), 'l');
+        assert_eq!(canonical_char('|'), 'l');
+        assert_eq!(canonical_char('¡'), 'l');
+        assert_eq!(canonical_char('8'), 'b');
+        assert_eq!(canonical_char('-'), '-');
+        assert_eq!(canonical_char('é'), 'é');
+    }
 }
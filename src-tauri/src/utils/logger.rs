@@ -1,29 +1,101 @@
 use std::fs::OpenOptions;
-use std::io::Write;
+use std::io::{BufWriter, Write};
 use std::path::Path;
 use std::path::PathBuf;
+use std::sync::mpsc::{self, Sender};
 use std::sync::Mutex;
 use std::sync::OnceLock;
+use std::thread::JoinHandle;
 use std::time::{SystemTime, UNIX_EPOCH};
 
-static LOG_FILE: OnceLock<Mutex<Option<PathBuf>>> = OnceLock::new();
+/// Lines are formatted on the calling thread and written by a background writer,
+/// so hot paths such as OCR hotkeys never block on disk I/O.
+static LOG_WRITER: OnceLock<Mutex<Option<LogWriter>>> = OnceLock::new();
 
+struct LogWriter {
+    sender: Sender<String>,
+    thread: JoinHandle<()>,
+}
+
+impl LogWriter {
+    fn start(log_file: &Path) -> Result<Self, String> {
+        let file = OpenOptions::new()
+            .create(true)
+            .append(true)
+            .open(log_file)
+            .map_err(|e| format!("Failed to open log file {:?}: {}", log_file, e))?;
+
+        let (sender, receiver) = mpsc::channel::<String>();
+        let thread = std::thread::Builder::new()
+            .name("logger".to_string())
+            .spawn(move || {
+                let mut writer = BufWriter::new(file);
+                // Drain whatever is queued, then flush once per batch.
+                while let Ok(line) = receiver.recv() {
+                    let _ = writer.write_all(line.as_bytes());
+                    while let Ok(line) = receiver.try_recv() {
+                        let _ = writer.write_all(line.as_bytes());
+                    }
+                    let _ = writer.flush();
+                }
+            })
+            .map_err(|e| format!("Failed to start logger thread: {}", e))?;
+
+        Ok(Self { sender, thread })
+    }
+
+    /// Closing the channel lets the thread write out what is queued and exit
+    fn stop(self) {
+        drop(self.sender);
+        let _ = self.thread.join();
+    }
+}
+
+/// An unwritable log file only disables logging; it never stops the app starting.
 pub fn init(logs_dir: &Path) -> Result<PathBuf, String> {
     std::fs::create_dir_all(logs_dir)
         .map_err(|e| format!("Failed to create logs directory {:?}: {}", logs_dir, e))?;
 
     let log_file = logs_dir.join("avalon-atlas.log");
-    let state = LOG_FILE.get_or_init(|| Mutex::new(None));
+    let writer = match LogWriter::start(&log_file) {
+        Ok(writer) => Some(writer),
+        Err(e) => {
+            eprintln!("Logging disabled: {}", e);
+            None
+        }
+    };
+
+    let state = LOG_WRITER.get_or_init(|| Mutex::new(None));
     let mut guard = state
         .lock()
         .map_err(|_| "Failed to lock logger state".to_string())?;
-    *guard = Some(log_file.clone());
+    let previous = std::mem::replace(&mut *guard, writer);
     drop(guard);
+    if let Some(previous) = previous {
+        previous.stop();
+    }
 
     info("app", format!("logger initialized at {:?}", log_file));
     Ok(log_file)
 }
 
+/// Write out every queued line and stop the writer; lines logged afterwards are
+/// dropped. Call before exiting, since the process does not wait for the thread.
+pub fn shutdown() {
+    let Some(state) = LOG_WRITER.get() else {
+        return;
+    };
+
+    let writer = match state.lock() {
+        Ok(mut guard) => guard.take(),
+        Err(_) => return,
+    };
+
+    if let Some(writer) = writer {
+        writer.stop();
+    }
+}
+
 pub fn info(target: &str, message: impl AsRef<str>) {
     write("INFO", target, message.as_ref());
 }
@@ -33,30 +105,25 @@ pub fn error(target: &str, message: impl AsRef<str>) {
 }
 
 fn write(level: &str, target: &str, message: &str) {
-    let Some(state) = LOG_FILE.get() else {
-        return;
-    };
-
-    let Ok(guard) = state.lock() else {
+    let Some(state) = LOG_WRITER.get() else {
         return;
     };
 
-    let Some(path) = guard.as_ref() else {
-        return;
-    };
-
-    let Ok(mut file) = OpenOptions::new().create(true).append(true).open(path) else {
-        return;
-    };
-
-    let _ = writeln!(
-        file,
-        "{} [{}] [{}] {}",
+    let line = format!(
+        "{} [{}] [{}] {}\n",
         timestamp(),
         level,
         target,
         message.replace('\n', "\\n").replace('\r', "\\r")
     );
+
+    let Ok(guard) = state.lock() else {
+        return;
+    };
+
+    if let Some(writer) = guard.as_ref() {
+        let _ = writer.sender.send(line);
+    }
 }
 
 fn timestamp() -> String {
@@ -66,3 +133,49 @@ fn timestamp() -> String {
 
     format!("{}.{:03}", duration.as_secs(), duration.subsec_millis())
 }
+
+#[cfg(test)]
+mod tests {
+    use super::{info, init, shutdown};
+    use std::sync::Mutex;
+
+    // The writer is process-wide, so tests that replace it take turns
+    static LOGGER: Mutex<()> = Mutex::new(());
+
+    #[test]
+    fn shutdown_writes_out_queued_lines() {
+        let _turn = LOGGER.lock().unwrap_or_else(|e| e.into_inner());
+        let logs_dir =
+            std::env::temp_dir().join(format!("avalon-atlas-logger-{}", std::process::id()));
+        let log_file = init(&logs_dir).unwrap();
+        for i in 0..100 {
+            info("test", format!("line {}", i));
+        }
+        shutdown();
+        info("test", "after shutdown");
+
+        let written = std::fs::read_to_string(&log_file).unwrap();
+        let _ = std::fs::remove_dir_all(&logs_dir);
+        assert!(written.contains("[test] line 99\n"));
+        assert!(!written.contains("after shutdown"));
+    }
+
+    #[test]
+    fn unwritable_log_file_disables_logging() {
+        let _turn = LOGGER.lock().unwrap_or_else(|e| e.into_inner());
+        let logs_dir = std::env::temp_dir().join(format!(
+            "avalon-atlas-logger-unwritable-{}",
+            std::process::id()
+        ));
+        // A directory where the log file should be makes the open fail
+        let log_file = logs_dir.join("avalon-atlas.log");
+        std::fs::create_dir_all(&log_file).unwrap();
+
+        let result = init(&logs_dir);
+        info("test", "dropped");
+        shutdown();
+
+        let _ = std::fs::remove_dir_all(&logs_dir);
+        assert_eq!(result, Ok(log_file));
+    }
+}
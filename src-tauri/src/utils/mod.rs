@@ -1,4 +1,5 @@
 pub mod capture;
+pub mod debug_image;
 pub mod frozen_screen;
 pub mod fuzzy;
 pub mod logger;